@@ -1,43 +1,51 @@
+import re
 import streamlit as st
-from utils.content_processor import ContentProcessor
-from utils.result_handler import ResultHandler
-import random
-from datetime import datetime
-import os
-import json
+from utils.nltk_resources import NLTKResourceError
+from utils.quiz_engine import QuizEngine
 
 
 class QuizGenerator:
+    """Streamlit front end over the process-wide QuizEngine"""
+
     def __init__(self):
-        if 'quiz_generator_initialized' not in st.session_state:
-            with st.spinner('Initializing Quiz Generator...'):
-                self.content_processor = ContentProcessor()
-                self.result_handler = ResultHandler()
-                st.session_state.quiz_generator_initialized = True
-
-    def generate_quiz(self, topic: str, num_questions: int):
-        """Generate a quiz for the given topic"""
-        sections = self.content_processor.get_content_sections(topic)
-        if not sections:
+        self.engine = QuizEngine()
+        self.engine.start_question_pool()
+        self.content_processor = self.engine.content_processor
+        self.result_handler = self.engine.result_handler
+
+    def stream_quiz(self, topic: str, num_questions: int, bank_ratio: float = None):
+        """
+        Generate a quiz for the given topic, rendering each question as soon as it is ready.
+        bank_ratio is the share of curated questions from the question bank.
+        """
+        try:
+            questions = self.engine.iter_quiz(topic, num_questions, bank_ratio=bank_ratio)
+        except ValueError:
             st.error(f"Topic not found. Please select a valid topic from the dropdown.")
             return None
+        return self._render_stream(questions, num_questions)
 
+    def stream_custom_quiz(self, num_questions: int, terms: list, match: str, topics: list):
+        """Like stream_quiz, for sections chosen by key terms and/or across several topics"""
+        try:
+            questions = self.engine.iter_custom_quiz(num_questions, terms, match, topics)
+        except ValueError as e:
+            st.error(str(e))
+            return None
+        return self._render_stream(questions, num_questions)
+
+    def _render_stream(self, question_iter, num_questions: int):
         questions = []
         try:
-            progress_bar = st.progress(0)
+            st.header("Take the Quiz")
             status_text = st.empty()
+            status_text.text(f"Generating question 1/{num_questions}")
 
-            for i in range(min(num_questions, len(sections))):
-                status_text.text(f"Generating question {i + 1}/{num_questions}")
-                progress_bar.progress((i + 1) / num_questions)
-
-                section = random.choice(sections)
-                sections.remove(section)  # Avoid duplicate questions
-                question_dict = self.content_processor.create_question(section)
-                if question_dict:
-                    questions.append(question_dict)
+            for question in question_iter:
+                render_question(len(questions), question)
+                questions.append(question)
+                status_text.text(f"Generating question {len(questions) + 1}/{num_questions}")
 
-            progress_bar.empty()
             status_text.empty()
             return questions
 
@@ -46,48 +54,71 @@ class QuizGenerator:
             return None
 
 
+@st.cache_resource(show_spinner='Initializing Quiz Generator...')
+def get_quiz_generator() -> QuizGenerator:
+    """One QuizGenerator per process, shared by all sessions"""
+    return QuizGenerator()
+
+
+def show_engine_stats(quiz_gen):
+    """Sidebar view of the shared generator's pool and cache counters"""
+    with st.sidebar.expander("Generator Stats"):
+        st.write("Question pool")
+        st.json(quiz_gen.engine.question_pool.stats())
+        st.write("Time to first question")
+        st.json(quiz_gen.engine.time_to_first_question.stats())
+        st.write("Processed-text cache")
+        st.json(quiz_gen.content_processor.cache_stats())
+        st.write("Result writer")
+        st.json(quiz_gen.result_handler.writer.stats())
+
+
 def initialize_session_state():
-    if 'quiz_gen' not in st.session_state:
-        st.session_state.quiz_gen = QuizGenerator()
+    # Session state holds only this user's quiz; the generator is shared
     if 'current_quiz' not in st.session_state:
         st.session_state.current_quiz = None
+        st.session_state.quiz_id = None
+        st.session_state.quiz_topic = None
     if 'user_answers' not in st.session_state:
         st.session_state.user_answers = {}
     if 'quiz_submitted' not in st.session_state:
         st.session_state.quiz_submitted = False
 
 
-def reset_quiz():
-    st.session_state.current_quiz = None
-    st.session_state.user_answers = {}
-    st.session_state.quiz_submitted = False
+def render_question(i: int, question):
+    """Show one question with its answer options"""
+    st.subheader(f"Question {i + 1}")
+    st.write(question.question)
 
+    # Format options with letters (A, B, C, D)
+    options = question.options
+    if options:
+        selected_answer = st.radio(
+            "Select your answer:",
+            range(len(options)),
+            format_func=lambda x: f"{chr(65 + x)}. {options[x]}",
+            key=f"question_{i}",
+            index=None
+        )
 
-def save_quiz_result(quiz, user_answers):
-    results_dir = "quiz_results"
-    if not os.path.exists(results_dir):
-        os.makedirs(results_dir)
+        if selected_answer is not None:
+            st.session_state.user_answers[i] = selected_answer
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = os.path.join(results_dir, f"quiz_result_{timestamp}.json")
+    st.markdown("---")
 
-    result_data = {
-        "timestamp": timestamp,
-        "questions": [],
-        "user_answers": user_answers
-    }
 
-    for q in quiz:
-        question_data = {
-            "question": q['question'],
-            "options": q['options'],
-            "correct_answer": q['correct_answer']
-        }
-        result_data["questions"].append(question_data)
+def reset_quiz():
+    st.session_state.current_quiz = None
+    st.session_state.quiz_id = None
+    st.session_state.quiz_topic = None
+    st.session_state.user_answers = {}
+    st.session_state.quiz_submitted = False
 
+
+def save_quiz_result(quiz_id, quiz, user_answers, topic=None):
+    """Save once per quiz_id; repeat calls do not write again"""
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(result_data, f, indent=4, ensure_ascii=False)
+        filename = get_quiz_generator().result_handler.save_result(quiz_id, quiz, user_answers, topic)
         st.success(f"Quiz results saved to: {filename}")
     except Exception as e:
         st.error(f"Error saving quiz results: {e}")
@@ -98,56 +129,73 @@ def main():
     st.title("📚 Interactive Quiz Generator")
 
     initialize_session_state()
+    try:
+        quiz_gen = get_quiz_generator()
+    except NLTKResourceError as e:
+        st.error(str(e))
+        st.stop()
+    show_engine_stats(quiz_gen)
 
     # Main quiz interface
     st.header("Generate a New Quiz")
 
+    quiz_mode = st.radio("Quiz type", ["By topic", "By key terms / several topics"], horizontal=True)
+    by_topic = quiz_mode == "By topic"
+    available_topics = quiz_gen.content_processor.get_available_topics()
+
     with st.form("quiz_parameters", clear_on_submit=False):
         col1, col2 = st.columns(2)
 
         with col1:
-            available_topics = st.session_state.quiz_gen.content_processor.get_available_topics()
-            topic = st.selectbox(
-                "Select Topic",
-                options=available_topics,
-                key="topic_selector"
-            ).lower()
+            if by_topic:
+                topic = st.selectbox(
+                    "Select Topic",
+                    options=available_topics,
+                    key="topic_selector"
+                ).lower()
+            else:
+                terms_text = st.text_input("Key terms", placeholder="e.g. hash, table",
+                                           help="Words the sections must mention, separated by commas or spaces")
+                match_all = st.radio("Match", ["All terms", "Any term"], horizontal=True) == "All terms"
+                selected_topics = st.multiselect(
+                    "Topics", options=available_topics,
+                    help="Leave empty to search every topic; pick several without terms for a mixed quiz"
+                )
 
         with col2:
             num_questions = st.number_input("Number of Questions",
                                           min_value=1,
                                           max_value=10,
                                           value=3)
+            if by_topic:
+                curated_percent = st.slider("Curated questions (%)", min_value=0, max_value=100,
+                                            value=30, step=10,
+                                            help="Share of hand-written questions, where the topic has them")
 
         generate_button = st.form_submit_button("Generate Quiz")
 
-    if generate_button and topic:
+    streamed = False
+    if generate_button and by_topic and topic:
+        reset_quiz()
+        st.session_state.current_quiz = quiz_gen.stream_quiz(topic, num_questions, curated_percent / 100)
+        st.session_state.quiz_id = quiz_gen.engine.new_quiz_id()
+        st.session_state.quiz_topic = topic
+        streamed = True
+    elif generate_button and not by_topic:
+        terms = [term for term in re.split(r'[,\s]+', terms_text) if term]
+        match = 'all' if match_all else 'any'
         reset_quiz()
-        st.session_state.current_quiz = st.session_state.quiz_gen.generate_quiz(topic, num_questions)
+        st.session_state.current_quiz = quiz_gen.stream_custom_quiz(num_questions, terms, match, selected_topics)
+        st.session_state.quiz_id = quiz_gen.engine.new_quiz_id()
+        st.session_state.quiz_topic = quiz_gen.engine.describe_custom_quiz(terms, match, selected_topics)
+        streamed = True
 
-    # Display quiz if it exists
+    # Display quiz if it exists (a freshly streamed quiz is already on the page)
     if st.session_state.current_quiz:
-        st.header("Take the Quiz")
-
-        for i, question in enumerate(st.session_state.current_quiz):
-            st.subheader(f"Question {i + 1}")
-            st.write(question['question'])
-
-            # Format options with letters (A, B, C, D)
-            options = question['options']
-            if options:
-                selected_answer = st.radio(
-                    "Select your answer:",
-                    range(len(options)),
-                    format_func=lambda x: f"{chr(65 + x)}. {options[x]}",
-                    key=f"question_{i}",
-                    index=None
-                )
-
-                if selected_answer is not None:
-                    st.session_state.user_answers[i] = options[selected_answer]
-
-            st.markdown("---")
+        if not streamed:
+            st.header("Take the Quiz")
+            for i, question in enumerate(st.session_state.current_quiz):
+                render_question(i, question)
 
         # Show submit button only if all questions are answered
         all_answered = len(st.session_state.user_answers) == len(st.session_state.current_quiz)
@@ -157,6 +205,11 @@ def main():
             with col1:
                 if st.button("Submit Quiz", key="submit_quiz"):
                     st.session_state.quiz_submitted = True
+                    # Save on the submit click only, not on every rerun afterwards
+                    save_quiz_result(st.session_state.quiz_id,
+                                     st.session_state.current_quiz,
+                                     st.session_state.user_answers,
+                                     st.session_state.quiz_topic)
             with col2:
                 if st.button("Clear Answers", key="clear_answers"):
                     st.session_state.user_answers = {}
@@ -169,19 +222,18 @@ def main():
 
             for i, question in enumerate(st.session_state.current_quiz):
                 user_answer = st.session_state.user_answers.get(i)
-                correct_answer = question['correct_answer']
-                is_correct = user_answer == correct_answer
+                is_correct = question.is_correct(user_answer)
                 correct_count += 1 if is_correct else 0
 
                 st.subheader(f"Question {i + 1}")
-                st.write(question['question'])
+                st.write(question.question)
 
                 if is_correct:
                     st.success("✅ Correct!")
                 else:
                     st.error("❌ Incorrect")
-                    st.write(f"Your answer: {user_answer}")
-                    st.write(f"Correct answer: {correct_answer}")
+                    st.write(f"Your answer: {question.options[user_answer]}")
+                    st.write(f"Correct answer: {question.correct_answer}")
 
                 st.markdown("---")
 
@@ -189,9 +241,6 @@ def main():
             st.header(f"Final Score: {score_percentage:.1f}%")
             st.progress(score_percentage / 100)
 
-            # Save results
-            save_quiz_result(st.session_state.current_quiz, st.session_state.user_answers)
-
             if st.button("Start New Quiz"):
                 reset_quiz()
                 st.rerun()
@@ -0,0 +1,54 @@
+"""
+Bulk analytics over a large result history: load, grade and aggregate
+hundreds of thousands of answered questions.
+
+    python -m benchmarks.analytics [quizzes]
+"""
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from utils.analytics import (load_attempts, option_selection_rates, question_difficulty,
+                             quiz_scores, score_distribution)
+
+TOPICS = ['python', 'algorithms', 'databases', 'web_development', 'operating_systems']
+
+
+def make_records(count: int) -> list:
+    start = datetime(2025, 1, 1)
+    records = []
+    for i in range(count):
+        topic = random.choice(TOPICS)
+        picked = random.sample(range(100), 5)
+        records.append({
+            'quiz_id': uuid.uuid4().hex,
+            'timestamp': (start + timedelta(minutes=i)).strftime("%Y%m%d_%H%M%S"),
+            'topic': topic,
+            'questions': [{'question': f"{topic} question {q}?", 'options': ['A', 'B', 'C', 'D'],
+                           'correct_index': q % 4} for q in picked],
+            'user_answers': {str(j): random.randrange(4) for j in range(5)}
+        })
+    return records
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<26} {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+def main():
+    quizzes = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    records = make_records(quizzes)
+    print(f"{quizzes} quizzes, {quizzes * 5} answered questions")
+    attempts = timed("load + grade", lambda: load_attempts(records))
+    scores = timed("quiz scores", lambda: quiz_scores(attempts))
+    timed("question difficulty", lambda: question_difficulty(attempts))
+    timed("option selection rates", lambda: option_selection_rates(attempts))
+    timed("score distribution", lambda: score_distribution(scores))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Section processing throughput: nltk.pos_tag per sentence (the original path),
+ContentProcessor._analyze_text per section, and ContentProcessor.process_batch.
+
+    python -m benchmarks.batch_processing [rounds]
+"""
+import sys
+import time
+from nltk.tag import pos_tag
+from nltk.tokenize import sent_tokenize, word_tokenize
+from utils.content_processor import ContentProcessor
+from utils.section_index import split_sections
+
+
+def legacy_process(processor, text):
+    for sentence in sent_tokenize(text):
+        words = [w for w in word_tokenize(sentence)
+                 if w.lower() not in processor.stop_words and w.isalnum()]
+        pos_tag(words)
+
+
+def timed(label, sections, rounds, fn):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    elapsed = time.perf_counter() - start
+    rate = len(sections) * rounds / elapsed
+    print(f"{label:<28} {elapsed:8.3f}s  {rate:10.1f} sections/s")
+    return rate
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    processor = ContentProcessor()
+    sections = [text for content in processor.content.values() for text in split_sections(content)]
+    print(f"{len(sections)} sections x {rounds} rounds")
+
+    timed("nltk.pos_tag per sentence", sections, rounds,
+          lambda: [legacy_process(processor, text) for text in sections])
+    per_section = timed("per-section _analyze_text", sections, rounds,
+                        lambda: [processor._analyze_text(text) for text in sections])
+
+    def batch():
+        processor.text_cache.clear()
+        processor.process_batch(sections)
+    batched = timed("process_batch", sections, rounds, batch)
+    print(f"Batch speedup over per-section: {batched / per_section:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Content-type classification: the original per-pattern re.search loop versus
+ContentClassifier, on every section of COMPUTING_CONTENT. Also checks the
+two produce identical labels.
+
+    python -m benchmarks.content_classifier [repeats]
+"""
+import re
+import sys
+import timeit
+from utils.content_processor import ContentProcessor
+
+
+def legacy_identify(patterns, text, processed):
+    text_lower = text.lower()
+    for content_type, pattern in patterns.items():
+        if re.search(pattern, text_lower):
+            return content_type
+    pos_sequence = [tag for _, tag in processed['pos_tags']]
+    if 'VBZ' in pos_sequence and pos_sequence.count('NN') > 2:
+        return 'definition'
+    elif pos_sequence.count('VB') > 2:
+        return 'process'
+    return 'general'
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    processor = ContentProcessor()
+    sections = processor.section_index.sections
+    classifier = processor.classifier
+
+    legacy = [legacy_identify(processor.patterns, s.text, s.processed) for s in sections]
+    compiled = classifier.classify_many(sections)
+    mismatches = [(s.id, a, b) for s, a, b in zip(sections, legacy, compiled) if a != b]
+    print(f"{len(sections)} sections, {len(mismatches)} label mismatches")
+    for section_id, a, b in mismatches[:10]:
+        print(f"  section {section_id}: legacy={a} compiled={b}")
+
+    legacy_time = timeit.timeit(
+        lambda: [legacy_identify(processor.patterns, s.text, s.processed) for s in sections],
+        number=repeats)
+    compiled_time = timeit.timeit(lambda: classifier.classify_many(sections), number=repeats)
+    per_call = 1e6 / (len(sections) * repeats)
+    print(f"legacy re.search loop:  {legacy_time * per_call:8.2f} us/section")
+    print(f"ContentClassifier:      {compiled_time * per_call:8.2f} us/section")
+    print(f"Speedup: {legacy_time / compiled_time:.2f}x")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
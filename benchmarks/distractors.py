@@ -0,0 +1,46 @@
+"""
+TF-IDF distractor engine: matrix build time and per-question lookup latency,
+plus a sample of the wrong options it picks.
+
+    python -m benchmarks.distractors [repeats]
+"""
+import sys
+import time
+from utils.content_processor import ContentProcessor
+from utils.distractors import DistractorEngine
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    processor = ContentProcessor()
+    sections = processor.section_index.sections
+
+    start = time.perf_counter()
+    engine = DistractorEngine(sections)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for i in range(len(sections)):
+            engine.nearest(i, 3)
+    by_id = (time.perf_counter() - start) / (repeats * len(sections))
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for section in sections:
+            engine.nearest_to_words(section.words, 3, section.text)
+    by_words = (time.perf_counter() - start) / (repeats * len(sections))
+
+    print(f"Sections:                 {len(sections)} ({len(engine.vocabulary)} terms, {len(engine.data)} non-zeros)")
+    print(f"Matrix build:             {build * 1000:.2f} ms")
+    print(f"Lookup by section id:     {by_id * 1e6:.1f} us/question")
+    print(f"Lookup by raw words:      {by_words * 1e6:.1f} us/question")
+
+    sample = sections[len(sections) // 2]
+    print(f"\nCorrect ({sample.topic}): {sample.text[:100]}")
+    for i in engine.nearest(sample.id, 3):
+        print(f"  wrong ({sections[i].topic}): {sections[i].text[:100]}")
+
+
+if __name__ == "__main__":
+    main()
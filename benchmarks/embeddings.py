@@ -0,0 +1,56 @@
+"""
+Hashed-embedding index: build time, single and batched top-k query speed, and
+all-pairs duplicate detection.
+
+    python -m benchmarks.embeddings [repeats]
+"""
+import sys
+import time
+from content_database import TRAINING_DATA
+from utils.content_processor import ContentProcessor
+from utils.embeddings import build_embedding_index
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    processor = ContentProcessor()
+    sections = processor.section_index.sections
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        index = build_embedding_index(sections, TRAINING_DATA, processor.stop_words)
+    build = (time.perf_counter() - start) / repeats
+
+    queries = [section.text for section in sections]
+    vectors = index.embedder.embed(queries)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for vector in vectors:
+            index.search(vector, 5)
+    single = (time.perf_counter() - start) / (repeats * len(vectors))
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        index.search(vectors, 5)
+    batched = (time.perf_counter() - start) / (repeats * len(vectors))
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        index.embedder.embed(queries)
+    embed = (time.perf_counter() - start) / (repeats * len(queries))
+
+    start = time.perf_counter()
+    pairs = index.duplicates()
+    duplicates = time.perf_counter() - start
+
+    print(f"Indexed texts:          {len(index)} ({index.matrix.shape[1]} dims, "
+          f"{index.matrix.nbytes / 1024:.0f} KiB)")
+    print(f"Index build:            {build * 1000:.1f} ms")
+    print(f"Embed text:             {embed * 1e6:.1f} us/text")
+    print(f"Top-5 query, one by one:{single * 1e6:8.1f} us/query")
+    print(f"Top-5 query, batched:   {batched * 1e6:8.1f} us/query ({len(vectors)} per batch)")
+    print(f"Duplicate scan:         {duplicates * 1000:.1f} ms ({len(pairs)} pairs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Local load generator for quiz_server.py: each client thread repeatedly creates
+a quiz and submits answers. Reports requests/sec and p50/p99 latency.
+
+    python -m benchmarks.load_test --clients 16 --duration 10               # in-process server
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --clients 16  # running server
+"""
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from urllib.parse import urlparse
+from utils.metrics import LatencyStats
+
+
+def request(host, port, method, path, payload=None):
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        conn.request(method, path, body=body, headers={'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read() or b'{}')
+    finally:
+        conn.close()
+
+
+def client(host, port, topics, num_questions, deadline, latency: LatencyStats, errors: list):
+    while time.perf_counter() < deadline:
+        try:
+            start = time.perf_counter()
+            status, quiz = request(host, port, 'POST', '/quizzes',
+                                   {'topic': random.choice(topics), 'num_questions': num_questions})
+            latency.record(time.perf_counter() - start)
+            if status != 201:
+                errors.append(status)
+                continue
+
+            answers = {str(i): random.randrange(len(q['options'])) for i, q in enumerate(quiz['questions'])}
+            start = time.perf_counter()
+            status, _ = request(host, port, 'POST', f"/quizzes/{quiz['quiz_id']}/answers", {'answers': answers})
+            latency.record(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+        except OSError as e:
+            errors.append(str(e))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for quiz_server.py")
+    parser.add_argument('--url', help="server to test (default: start one in-process)")
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--questions', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=8, help="worker pool size for the in-process server")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname, parsed.port or 80
+    else:
+        from quiz_server import make_server
+        server = make_server(port=0, workers=args.workers, save_results=False)
+        host, port = server.server_address
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    _, body = request(host, port, 'GET', '/topics')
+    topics = body['topics']
+
+    latency = LatencyStats(window=1_000_000)
+    errors = []
+    deadline = time.perf_counter() + args.duration
+    threads = [threading.Thread(target=client, args=(host, port, topics, args.questions, deadline, latency, errors))
+               for _ in range(args.clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    stats = latency.stats()
+    print(f"Clients: {args.clients}  Duration: {elapsed:.1f}s  Requests: {stats['count']}  Errors: {len(errors)}")
+    print(f"Throughput: {stats['count'] / elapsed:.1f} req/s")
+    print(f"Latency p50: {stats['p50_ms']:.1f} ms  p99: {stats['p99_ms']:.1f} ms  mean: {stats['mean_ms']:.1f} ms")
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+MinHash/LSH clustering at scale: the corpus sections repeated `scale` times, each
+copy with a few words changed, must collapse back into roughly one cluster per
+original section, with build time growing about linearly.
+
+    python -m benchmarks.near_duplicates [scale]
+"""
+import random
+import sys
+import time
+from utils.content_processor import ContentProcessor
+from utils.near_duplicates import cluster_near_duplicates
+
+
+def perturb(text: str, rng: random.Random, changes: int = 1) -> str:
+    words = text.split()
+    for _ in range(changes if len(words) > 12 else 0):
+        words[rng.randrange(len(words))] = f"w{rng.randrange(10 ** 6)}"
+    return ' '.join(words)
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rng = random.Random(0)
+    originals = [s.text for s in ContentProcessor().section_index.sections]
+
+    for factor in sorted({1, max(scale // 10, 1), scale}):
+        texts = [perturb(text, rng) if copy else text for copy in range(factor) for text in originals]
+        start = time.perf_counter()
+        clusters = cluster_near_duplicates(texts)
+        elapsed = time.perf_counter() - start
+
+        # Copies of one original that ended up outside the original's cluster
+        stray = sum(clusters[copy * len(originals) + i] != clusters[i]
+                    for copy in range(1, factor) for i in range(len(originals)))
+        print(f"{len(texts):>7} sections: {elapsed * 1000:9.1f} ms, {len(set(clusters)):>5} clusters, "
+              f"{stray} of {len(texts) - len(originals)} copies not merged")
+
+
+if __name__ == "__main__":
+    main()
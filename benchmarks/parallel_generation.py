@@ -0,0 +1,51 @@
+"""
+Serial versus process-pool question generation over every section of
+COMPUTING_CONTENT, for raw texts (full NLP in the worker) and indexed sections.
+Pool startup (each worker loading NLTK data and building the similarity indexes) is
+timed separately and included in a second speedup figure: a one-off job pays it, a
+long-lived QuizEngine pays it once.
+
+    python -m benchmarks.parallel_generation [rounds] [max_workers]
+"""
+import os
+import sys
+import time
+from utils.content_processor import ContentProcessor
+from utils.parallel import ParallelQuestionGenerator
+
+
+def run(label, fn, count):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:8.3f}s  {count / elapsed:10.1f} questions/s")
+    return elapsed
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    processor = ContentProcessor()
+    sections = list(processor.section_index.sections) * rounds
+    # Unique strings per round so no worker cache hits skew the raw-text numbers
+    texts = [f"{s.text} ({i // len(processor.section_index)})" for i, s in enumerate(sections)]
+    print(f"{len(sections)} questions per run")
+
+    for kind, items in (("raw text", texts), ("indexed", sections)):
+        print(f"-- {kind}")
+        processor.text_cache.clear()
+        serial = run("serial", lambda: [processor.create_question(i) for i in items], len(items))
+        workers = 1
+        while workers <= max_workers:
+            start = time.perf_counter()
+            with ParallelQuestionGenerator(processor, workers) as generator:
+                startup = time.perf_counter() - start
+                elapsed = run(f"{workers} worker(s)", lambda: generator.generate(items), len(items))
+            print(f"{'':<24} pool startup {startup:.3f}s; speedup {serial / elapsed:.2f}x warm, "
+                  f"{serial / (startup + elapsed):.2f}x including startup, "
+                  f"efficiency {serial / elapsed / workers:.0%}")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
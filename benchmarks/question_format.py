@@ -0,0 +1,79 @@
+"""
+Old question dicts (option text duplicated in correct_answer, answers stored as text)
+versus compact Question records (interned options, answer indices): session memory,
+saved result size and grading time.
+
+    python -m benchmarks.question_format [quizzes]
+"""
+import json
+import sys
+import time
+import tracemalloc
+from utils.quiz_engine import QuizEngine
+from utils.result_store import score_result
+
+
+def legacy_form(question) -> dict:
+    # Fresh strings, as the old create_question built them for every quiz
+    options = [''.join(option) for option in question.options]
+    return {'question': ''.join(question.question), 'options': options,
+            'correct_answer': options[question.correct_index]}
+
+
+def measure(build) -> int:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del kept
+    return sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+
+
+def main():
+    quizzes = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    engine = QuizEngine(background_writes=False)
+    topic = engine.get_available_topics()[0]
+    generated = [engine.generate_quiz(topic, 3, seed=i) for i in range(quizzes)]
+
+    def legacy_sessions():
+        sessions = []
+        for quiz in generated:
+            questions = [legacy_form(q) for q in quiz]
+            sessions.append((questions, {i: q['options'][0] for i, q in enumerate(questions)}))
+        return sessions
+
+    def compact_sessions():
+        sessions = []
+        for quiz in generated:
+            questions = [type(q)(q.question, q.options, q.correct_index, q.section_id) for q in quiz]
+            sessions.append((questions, {i: 0 for i in range(len(questions))}))
+        return sessions
+
+    legacy_memory = measure(legacy_sessions) / quizzes
+    compact_memory = measure(compact_sessions) / quizzes
+
+    legacy_records = [{'questions': [legacy_form(q) for q in quiz],
+                       'user_answers': {str(i): q.options[0] for i, q in enumerate(quiz)}} for quiz in generated]
+    compact_records = [{'questions': [q.to_record() for q in quiz],
+                        'user_answers': {str(i): 0 for i in range(len(quiz))}} for quiz in generated]
+    legacy_bytes = sum(len(json.dumps(r, indent=4, ensure_ascii=False)) for r in legacy_records) / quizzes
+    compact_bytes = sum(len(json.dumps(r, indent=4, ensure_ascii=False)) for r in compact_records) / quizzes
+
+    start = time.perf_counter()
+    for r in legacy_records:
+        score_result(r['questions'], r['user_answers'])
+    legacy_grading = time.perf_counter() - start
+    start = time.perf_counter()
+    for quiz in generated:
+        sum(q.is_correct(0) for q in quiz)
+    compact_grading = time.perf_counter() - start
+
+    print(f"Quizzes:             {quizzes} x 3 questions")
+    print(f"Session memory:      {legacy_memory / 1024:.2f} -> {compact_memory / 1024:.2f} KiB/quiz")
+    print(f"Saved result size:   {legacy_bytes:.0f} -> {compact_bytes:.0f} bytes/quiz")
+    print(f"Grading:             {legacy_grading * 1e6 / quizzes:.2f} -> {compact_grading * 1e6 / quizzes:.2f} us/quiz")
+
+
+if __name__ == "__main__":
+    main()
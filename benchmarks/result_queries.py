@@ -0,0 +1,82 @@
+"""
+Query latency over a growing result history: "python scores for the last 7 days"
+and most-missed questions (all time and last 7 days). With the SQLite answer index
+these stay flat as history grows; the JSON-file store rescans everything.
+
+    python -m benchmarks.result_queries [final_size]
+"""
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from utils.result_store import JSONFileResultStore, SQLiteResultStore, days_ago
+
+TOPICS = ['python', 'algorithms', 'databases', 'web_development', 'operating_systems']
+QUESTIONS_PER_TOPIC = 200
+NOW = datetime(2026, 1, 1)
+
+
+def make_records(start: int, count: int) -> list:
+    """Records going back in time, one every 10 minutes, newest first"""
+    records = []
+    for i in range(start, start + count):
+        topic = TOPICS[i % len(TOPICS)]
+        picked = random.sample(range(QUESTIONS_PER_TOPIC), 5)
+        questions = [{'question': f"{topic} question {q}?", 'options': ['A', 'B', 'C', 'D'], 'correct_index': 0}
+                     for q in picked]
+        # Higher-numbered questions are harder
+        answers = {str(j): 0 if random.random() > q / QUESTIONS_PER_TOPIC else 1 for j, q in enumerate(picked)}
+        records.append({
+            'quiz_id': uuid.uuid4().hex,
+            'timestamp': (NOW - timedelta(minutes=10 * i)).strftime("%Y%m%d_%H%M%S"),
+            'topic': topic,
+            'score': sum(a == 0 for a in answers.values()) * 20.0,
+            'questions': questions,
+            'user_answers': answers
+        })
+    return records
+
+
+def timed(fn, repeats: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def report(label: str, store, repeats: int):
+    week = days_ago(7, NOW)
+    scores = timed(lambda: store.scores('python', since=week), repeats)
+    missed = timed(lambda: store.most_missed('python', limit=10), repeats)
+    missed_week = timed(lambda: store.most_missed('python', since=week, limit=10), repeats)
+    print(f"{label:<22} {store.count():>8} {scores:12.2f} {missed:12.2f} {missed_week:12.2f}")
+
+
+def main():
+    final_size = int(sys.argv[1]) if len(sys.argv) > 1 else 80000
+    sizes = [size for size in (5000, 20000, 80000, 320000) if size <= final_size] or [final_size]
+    workdir = tempfile.mkdtemp()
+    try:
+        print(f"{'store':<22} {'records':>8} {'7d scores':>12} {'missed':>12} {'missed 7d':>12}   (ms/query)")
+        json_store = JSONFileResultStore(f"{workdir}/json")
+        json_store.save_many(make_records(0, min(sizes[0], 2000)))
+        report("json files (scan)", json_store, repeats=2)
+
+        store = SQLiteResultStore(f"{workdir}/results.db")
+        loaded = 0
+        for size in sizes:
+            records = make_records(loaded, size - loaded)
+            for i in range(0, len(records), 1000):
+                store.save_many(records[i:i + 1000])
+            loaded = size
+            report("sqlite answer index", store, repeats=20)
+        store.close()
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
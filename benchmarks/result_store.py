@@ -0,0 +1,79 @@
+"""
+Result store insert throughput and query latency: one JSON file per quiz
+versus SQLite (single inserts and batched inserts).
+
+    python -m benchmarks.result_store [records]
+"""
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from utils.result_store import JSONFileResultStore, SQLiteResultStore
+
+TOPICS = ['python', 'algorithms', 'databases', 'web_development', 'operating_systems']
+
+
+def make_records(count: int) -> list:
+    start = datetime(2025, 1, 1)
+    records = []
+    for i in range(count):
+        questions = [{'question': f"Question {j}?", 'options': ['A', 'B', 'C', 'D'], 'correct_answer': 'A'}
+                     for j in range(5)]
+        answers = {str(j): random.choice('ABCD') for j in range(5)}
+        records.append({
+            'quiz_id': uuid.uuid4().hex,
+            'timestamp': (start + timedelta(minutes=i)).strftime("%Y%m%d_%H%M%S"),
+            'topic': random.choice(TOPICS),
+            'score': sum(a == 'A' for a in answers.values()) * 20.0,
+            'questions': questions,
+            'user_answers': answers
+        })
+    return records
+
+
+def bench_inserts(label, store, records, batch_size=None):
+    start = time.perf_counter()
+    if batch_size:
+        for i in range(0, len(records), batch_size):
+            store.save_many(records[i:i + batch_size])
+    else:
+        for record in records:
+            store.save(record)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {len(records) / elapsed:10.0f} inserts/s")
+
+
+def bench_query(label, store, records, repeats=20):
+    since = records[len(records) * 3 // 4]['timestamp']
+    start = time.perf_counter()
+    for _ in range(repeats):
+        matches = store.query(topic='python', since=since)
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"{label:<28} {elapsed * 1000:10.2f} ms/query ({len(matches)} matches)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    records = make_records(count)
+    workdir = tempfile.mkdtemp()
+    try:
+        json_store = JSONFileResultStore(f"{workdir}/json")
+        bench_inserts("json files", json_store, records)
+        single = SQLiteResultStore(f"{workdir}/single.db")
+        bench_inserts("sqlite single inserts", single, records)
+        batched = SQLiteResultStore(f"{workdir}/batched.db")
+        bench_inserts("sqlite batched (500)", batched, records, batch_size=500)
+
+        bench_query("json files query", json_store, records, repeats=3)
+        bench_query("sqlite query", batched, records)
+        single.close()
+        batched.close()
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
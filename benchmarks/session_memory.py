@@ -0,0 +1,51 @@
+"""
+Memory per Streamlit session: one QuizEngine per session (the old layout)
+versus one shared engine with only the quiz and answers in session state.
+
+    python -m benchmarks.session_memory [sessions]
+"""
+import sys
+import tracemalloc
+from utils.quiz_engine import QuizEngine
+
+
+def session_state(engine, topic):
+    quiz = engine.generate_quiz(topic, 3)
+    return {
+        'current_quiz': quiz,
+        'user_answers': {i: 0 for i in range(len(quiz))},
+        'quiz_submitted': False,
+    }
+
+
+def measure(sessions: int, shared: bool) -> int:
+    shared_engine = QuizEngine()  # warm NLTK before measuring
+    topic = shared_engine.get_available_topics()[0]
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    states = []
+    for _ in range(sessions):
+        engine = shared_engine if shared else QuizEngine()
+        state = session_state(engine, topic)
+        if not shared:
+            state['quiz_gen'] = engine
+        states.append(state)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    return sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    per_session = measure(sessions, shared=False) / sessions
+    shared = measure(sessions, shared=True) / sessions
+    print(f"Sessions:                 {sessions}")
+    print(f"Engine per session:       {per_session / 1024:.1f} KiB/session")
+    print(f"Shared engine:            {shared / 1024:.1f} KiB/session")
+    print(f"Saved per session:        {(per_session - shared) / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
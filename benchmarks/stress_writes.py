@@ -0,0 +1,95 @@
+"""
+Multi-process write stress test for QuizHistory and the result stores.
+N processes append to one history log and save results to the same JSON and
+SQLite stores while another process compacts the log; afterwards every record
+must be present exactly once and every file must parse.
+
+    python -m benchmarks.stress_writes [processes] [records_per_process]
+"""
+import glob
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from utils.quiz_history import QuizHistory
+from utils.result_store import JSONFileResultStore, SQLiteResultStore
+
+
+def writer(workdir: str, worker: int, count: int):
+    history = QuizHistory(os.path.join(workdir, 'history.jsonl'), fsync_every=16)
+    json_store = JSONFileResultStore(os.path.join(workdir, 'results'))
+    sqlite_store = SQLiteResultStore(os.path.join(workdir, 'results.db'))
+    for seq in range(count):
+        history.add_quiz({'worker': worker, 'seq': seq})
+        record = {'quiz_id': f"{worker}-{seq}", 'timestamp': time.strftime("%Y%m%d_%H%M%S"),
+                  'topic': 'stress', 'score': 0.0, 'questions': [], 'user_answers': {}}
+        json_store.save(record)
+        sqlite_store.save(record)
+    history.close()
+    sqlite_store.close()
+
+
+def compactor(workdir: str, stop):
+    history = QuizHistory(os.path.join(workdir, 'history.jsonl'))
+    while not stop.is_set():
+        history.compact()
+        time.sleep(0.01)
+
+
+def main():
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    workdir = tempfile.mkdtemp()
+    try:
+        stop = multiprocessing.Event()
+        compacting = multiprocessing.Process(target=compactor, args=(workdir, stop))
+        compacting.start()
+        start = time.perf_counter()
+        workers = [multiprocessing.Process(target=writer, args=(workdir, i, count)) for i in range(processes)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        compacting.join()
+
+        expected = {(w, s) for w in range(processes) for s in range(count)}
+        with open(os.path.join(workdir, 'history.jsonl'), encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        corrupt = 0
+        seen = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                seen.append((entry['worker'], entry['seq']))
+            except (ValueError, KeyError):
+                corrupt += 1
+        history_ok = set(seen) == expected and len(seen) == len(expected) and not corrupt
+
+        result_files = glob.glob(os.path.join(workdir, 'results', 'quiz_result_*.json'))
+        unreadable = 0
+        for path in result_files:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    json.load(f)
+            except ValueError:
+                unreadable += 1
+        json_ok = len(result_files) == len(expected) and not unreadable
+        sqlite_count = SQLiteResultStore(os.path.join(workdir, 'results.db')).count()
+        sqlite_ok = sqlite_count == len(expected)
+
+        print(f"{processes} processes x {count} records in {elapsed:.2f}s (with concurrent compaction)")
+        print(f"history: {len(seen)}/{len(expected)} entries, {corrupt} corrupt lines -> {'OK' if history_ok else 'FAIL'}")
+        print(f"json results: {len(result_files)}/{len(expected)} files, {unreadable} unreadable -> {'OK' if json_ok else 'FAIL'}")
+        print(f"sqlite results: {sqlite_count}/{len(expected)} rows -> {'OK' if sqlite_ok else 'FAIL'}")
+        sys.exit(0 if history_ok and json_ok and sqlite_ok else 1)
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
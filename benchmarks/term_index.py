@@ -0,0 +1,42 @@
+"""
+Key-term lookups: posting-list AND/OR queries against a linear scan of every
+section's key terms, for random pairs of known terms.
+
+    python -m benchmarks.term_index [queries]
+"""
+import random
+import sys
+import time
+from utils.content_processor import ContentProcessor
+
+
+def scan(sections, terms, match):
+    test = all if match == 'all' else any
+    return [s.id for s in sections if test(term in {t.lower() for t in s.key_terms} for term in terms)]
+
+
+def main():
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    index = ContentProcessor().section_index
+    sections = index.sections
+    rng = random.Random(0)
+    known = sorted(index.terms.postings)
+    pairs = [rng.sample(known, 2) for _ in range(queries)]
+
+    print(f"{len(sections)} sections, {len(index.terms)} distinct key terms")
+    for match in ('all', 'any'):
+        start = time.perf_counter()
+        found = [index.terms.search(terms, match) for terms in pairs]
+        indexed = (time.perf_counter() - start) / queries
+
+        start = time.perf_counter()
+        expected = [sorted(scan(sections, terms, match)) for terms in pairs]
+        scanned = (time.perf_counter() - start) / queries
+
+        assert found == expected
+        print(f"match={match}: index {indexed * 1e6:8.1f} us/query, scan {scanned * 1e6:9.1f} us/query "
+              f"({sum(map(len, found)) / queries:.1f} hits/query)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Headless HTTP quiz service (standard library only).
+
+    python quiz_server.py --port 8000 --workers 8
+
+Endpoints:
+    GET  /topics                    -> {"topics": [...]}
+    POST /quizzes                   {"topic": "python", "num_questions": 3}
+                                    or {"terms": ["hash", "table"], "match": "all"|"any", "topics": [...]}
+                                    -> {"quiz_id", "topic", "questions": [{"question", "options"}]}
+    POST /quizzes/<quiz_id>/answers {"answers": {"0": 2, "1": 0}}   (option index per question)
+                                    -> {"quiz_id", "correct", "total", "score", "results": [...]}
+    GET  /stats                     -> pool, cache and latency counters
+
+Malformed requests (bad Content-Length, a body that is not a JSON object, num_questions
+outside 1..MAX_QUESTIONS, terms or topics that are not lists, answers that are not option
+indices of the quiz) get 400 {"error": ...}; a rejected submission leaves the quiz open.
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from utils.metrics import LatencyStats
+from utils.quiz_engine import QuizEngine
+
+MAX_QUESTIONS = 50
+
+
+class BadRequest(Exception):
+    """A malformed request, answered with 400"""
+
+
+class QuizService:
+    """Quiz generation and grading on top of a shared QuizEngine, without any HTTP"""
+
+    def __init__(self, engine: QuizEngine, max_active_quizzes: int = 10000, save_results: bool = True):
+        self.engine = engine
+        self.max_active_quizzes = max_active_quizzes
+        self.save_results = save_results
+        self._quizzes = OrderedDict()  # quiz_id -> (topic, questions), oldest first
+        self._lock = threading.Lock()
+
+    def topics(self) -> list:
+        return self.engine.get_available_topics()
+
+    def create_quiz(self, topic: str, num_questions: int, terms=(), match: str = 'all', topics=None) -> dict:
+        """
+        A quiz on one topic, or (with no topic) on sections matching key terms and/or
+        spanning several topics. Raises ValueError for an unknown topic or no match.
+        """
+        if topic:
+            questions = self.engine.generate_quiz(topic, num_questions)
+        else:
+            questions = self.engine.generate_custom_quiz(num_questions, terms, match, topics)
+            topic = self.engine.describe_custom_quiz(terms, match, topics)
+        quiz_id = self.engine.new_quiz_id()
+        with self._lock:
+            self._quizzes[quiz_id] = (topic, questions)
+            while len(self._quizzes) > self.max_active_quizzes:
+                self._quizzes.popitem(last=False)
+        return {
+            'quiz_id': quiz_id,
+            'topic': topic,
+            'questions': [{'question': q.question, 'options': list(q.options)} for q in questions]
+        }
+
+    def submit_answers(self, quiz_id: str, answers: dict) -> dict:
+        """
+        Grade answers ({question index: option index or null}; missing questions count as
+        unanswered). Raises KeyError for an unknown quiz and ValueError for an answer that
+        is not a valid option index, in which case the quiz stays open for a corrected submit.
+        """
+        with self._lock:
+            topic, questions = self._quizzes[quiz_id]
+            user_answers = self._check_answers(questions, answers)
+            del self._quizzes[quiz_id]
+
+        results = []
+        for i, q in enumerate(questions):
+            choice = user_answers[i]
+            results.append({'correct': q.is_correct(choice), 'correct_option': q.correct_index})
+
+        correct = sum(r['correct'] for r in results)
+        if self.save_results:
+            self.engine.result_handler.save_result(quiz_id, questions, user_answers, topic)
+        return {
+            'quiz_id': quiz_id,
+            'correct': correct,
+            'total': len(questions),
+            'score': correct / len(questions) * 100 if questions else 0.0,
+            'results': results
+        }
+
+    @staticmethod
+    def _check_answers(questions: list, answers: dict) -> dict:
+        """{question index: option index or None}, or ValueError naming the first bad entry"""
+        user_answers = dict.fromkeys(range(len(questions)))
+        for key, choice in answers.items():
+            index = int(key) if isinstance(key, str) and key.isdigit() else None
+            if index is None or index >= len(questions):
+                raise ValueError(f"answers has no question {key!r}")
+            if choice is not None and (type(choice) is not int
+                                       or not 0 <= choice < len(questions[index].options)):
+                raise ValueError(f"answer to question {key} must be an option index "
+                                 f"from 0 to {len(questions[index].options) - 1}, not {choice!r}")
+            user_answers[index] = choice
+        return user_answers
+
+    def stats(self) -> dict:
+        pool = self.engine.question_pool
+        writer = self.engine.result_handler.writer
+        return {
+            'active_quizzes': len(self._quizzes),
+            'result_writes': self.engine.result_handler.writes,
+            'result_writer': writer.stats() if writer else None,
+            'question_pool': pool.stats() if pool else None,
+            'text_cache': self.engine.content_processor.cache_stats(),
+            'time_to_first_question': self.engine.time_to_first_question.stats()
+        }
+
+
+class QuizRequestHandler(BaseHTTPRequestHandler):
+    service = None  # set by make_server
+    latency = None
+    answers_path = re.compile(r'^/quizzes/([0-9a-f]+)/answers$')
+
+    def do_GET(self):
+        if self.path == '/topics':
+            self._timed(lambda: (200, {'topics': self.service.topics()}))
+        elif self.path == '/stats':
+            self._timed(lambda: (200, dict(self.service.stats(), http=self.latency.stats())))
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def do_POST(self):
+        match = self.answers_path.match(self.path)
+        if self.path == '/quizzes':
+            self._timed(self._create_quiz)
+        elif match:
+            self._timed(lambda: self._submit_answers(match.group(1)))
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def _create_quiz(self):
+        body = self._read_json()
+        num_questions = body.get('num_questions', 3)
+        if type(num_questions) is not int or not 1 <= num_questions <= MAX_QUESTIONS:
+            raise BadRequest(f"num_questions must be an integer from 1 to {MAX_QUESTIONS}")
+        for field in ('terms', 'topics'):
+            if not isinstance(body.get(field, []), list):
+                raise BadRequest(f"{field} must be a list of strings")
+        try:
+            return 201, self.service.create_quiz(
+                str(body.get('topic') or '').lower(), num_questions,
+                terms=[str(term) for term in body.get('terms', [])],
+                match=str(body.get('match', 'all')),
+                topics=[str(topic) for topic in body.get('topics', [])]
+            )
+        except ValueError as e:
+            return 400, {'error': str(e)}
+
+    def _submit_answers(self, quiz_id):
+        answers = self._read_json().get('answers', {})
+        if not isinstance(answers, dict):
+            raise BadRequest("answers must be an object mapping question index to option index")
+        try:
+            return 200, self.service.submit_answers(quiz_id, answers)
+        except KeyError:
+            return 404, {'error': f'unknown or already submitted quiz: {quiz_id}'}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+
+    def _read_json(self) -> dict:
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            raise BadRequest("invalid Content-Length")
+        if length < 0:
+            raise BadRequest("invalid Content-Length")
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            raise BadRequest("request body is not valid JSON")
+        if not isinstance(body, dict):
+            raise BadRequest("request body must be a JSON object")
+        return body
+
+    def _timed(self, handler):
+        start = time.perf_counter()
+        try:
+            status, payload = handler()
+        except BadRequest as e:
+            status, payload = 400, {'error': str(e)}
+        except Exception as e:
+            status, payload = 500, {'error': str(e)}
+        self._send(status, payload)
+        self.latency.record(time.perf_counter() - start)
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep the console quiet under load
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that handles connections on a fixed-size worker pool"""
+
+    def __init__(self, address, handler_class, workers: int):
+        super().__init__(address, handler_class)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http")
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def make_server(host: str = '127.0.0.1', port: int = 8000, workers: int = 8, pool_size: int = 20,
+                engine: QuizEngine = None, save_results: bool = True, bank_ratio: float = 0.0) -> PooledHTTPServer:
+    engine = engine or QuizEngine(bank_ratio=bank_ratio)
+    if pool_size:
+        engine.start_question_pool(pool_size)
+    handler = type('Handler', (QuizRequestHandler,), {
+        'service': QuizService(engine, save_results=save_results),
+        'latency': LatencyStats(window=10000)
+    })
+    return PooledHTTPServer((host, port), handler, workers)
+
+
+def ratio(value: str) -> float:
+    share = float(value)
+    if not 0.0 <= share <= 1.0:
+        raise argparse.ArgumentTypeError(f"must be between 0 and 1, not {value}")
+    return share
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless quiz generation service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=8, help="request handler threads")
+    parser.add_argument('--pool-size', type=int, default=20, help="ready questions per topic (0 disables)")
+    parser.add_argument('--no-save', action='store_true', help="do not persist submitted results")
+    parser.add_argument('--bank-ratio', type=ratio, default=0.0,
+                        help="share of each quiz taken from the curated question bank (0-1)")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.workers, args.pool_size,
+                         save_results=not args.no_save, bank_ratio=args.bank_ratio)
+    print(f"Quiz service listening on http://{args.host}:{args.port} with {args.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Bulk grading and analytics over saved quiz results with pandas.
+
+Results are flattened into one row per answered question (an "attempt"); grading,
+question difficulty, option popularity and score distributions are then column
+operations over the whole history at once.
+
+    python -m utils.analytics [store spec] [--topic TOPIC] [--top N]
+"""
+import argparse
+import numpy as np
+import pandas as pd
+from utils.result_store import ResultStore, open_result_store
+
+NO_ANSWER = -1
+
+
+def load_attempts(records) -> pd.DataFrame:
+    """
+    One row per question per saved quiz: quiz_id, timestamp, topic, question,
+    num_options, correct_index and choice (option index, NO_ANSWER if unanswered).
+    records may be a ResultStore or any iterable of result records.
+    """
+    if isinstance(records, ResultStore):
+        records = records.iter_records()
+
+    quiz_ids, timestamps, topics, questions = [], [], [], []
+    num_options, correct_indices, choices = [], [], []
+    for record in records:
+        answers = record.get('user_answers', {})
+        for i, q in enumerate(record.get('questions', [])):
+            options = q['options']
+            answer = answers.get(str(i), answers.get(i))
+            if 'correct_index' in q:
+                correct_index = q['correct_index']
+            else:  # older records store option text
+                correct_index = options.index(q['correct_answer'])
+                answer = options.index(answer) if answer in options else None
+            quiz_ids.append(record['quiz_id'])
+            timestamps.append(record['timestamp'])
+            topics.append(record.get('topic') or '')
+            questions.append(q['question'])
+            num_options.append(len(options))
+            correct_indices.append(correct_index)
+            choices.append(NO_ANSWER if answer is None else answer)
+
+    attempts = pd.DataFrame({
+        'quiz_id': pd.Categorical(quiz_ids),
+        'timestamp': pd.to_datetime(pd.Series(timestamps, dtype=object), format="%Y%m%d_%H%M%S"),
+        'topic': pd.Categorical(topics),
+        'question': pd.Categorical(questions),
+        'num_options': np.asarray(num_options, dtype=np.int8),
+        'correct_index': np.asarray(correct_indices, dtype=np.int8),
+        'choice': np.asarray(choices, dtype=np.int8),
+    })
+    return grade(attempts)
+
+
+def grade(attempts: pd.DataFrame) -> pd.DataFrame:
+    """Add the `correct` column: one vectorized compare over every attempt"""
+    attempts['correct'] = attempts['choice'].to_numpy() == attempts['correct_index'].to_numpy()
+    return attempts
+
+
+def quiz_scores(attempts: pd.DataFrame) -> pd.DataFrame:
+    """Per quiz: topic, timestamp, questions, correct and score (percent)"""
+    scores = attempts.groupby('quiz_id', observed=True).agg(
+        topic=('topic', 'first'),
+        timestamp=('timestamp', 'first'),
+        questions=('correct', 'size'),
+        correct=('correct', 'sum'),
+    )
+    scores['score'] = scores['correct'] / scores['questions'] * 100
+    return scores.sort_values('timestamp')
+
+
+def question_difficulty(attempts: pd.DataFrame, min_attempts: int = 1) -> pd.DataFrame:
+    """
+    Per question: attempts, share answered correctly, difficulty (1 - p_correct) and
+    skip rate; hardest first.
+    """
+    grouped = attempts.assign(skipped=attempts['choice'] == NO_ANSWER).groupby(
+        ['topic', 'question'], observed=True)
+    stats = grouped.agg(attempts=('correct', 'size'), p_correct=('correct', 'mean'),
+                        skip_rate=('skipped', 'mean'))
+    stats['difficulty'] = 1 - stats['p_correct']
+    stats = stats[stats['attempts'] >= min_attempts]
+    return stats.sort_values(['difficulty', 'attempts'], ascending=False)
+
+
+def option_selection_rates(attempts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per question, the share of attempts choosing each option index (columns 0..n-1,
+    plus NO_ANSWER for skips); the correct option is in `correct_index`.
+    """
+    counts = attempts.groupby(['topic', 'question', 'choice'], observed=True).size().unstack(fill_value=0)
+    rates = counts.div(counts.sum(axis=1), axis=0)
+    correct = attempts.groupby(['topic', 'question'], observed=True)['correct_index'].first()
+    rates.columns = list(rates.columns)
+    return rates.join(correct)
+
+
+def score_distribution(scores: pd.DataFrame, bins: int = 10) -> pd.DataFrame:
+    """Number of quizzes per score band, one column per topic"""
+    edges = np.linspace(0, 100, bins + 1)
+    bands = pd.cut(scores['score'], edges, include_lowest=True)
+    return pd.crosstab(bands, scores['topic'])
+
+
+def topic_summary(scores: pd.DataFrame) -> pd.DataFrame:
+    """Per topic: quiz count and mean/median/percentile scores"""
+    return scores.groupby('topic', observed=True)['score'].describe(percentiles=[.25, .5, .75])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quiz result analytics")
+    parser.add_argument('store', nargs='?', help='store spec, e.g. sqlite:quiz_results/quiz_results.db')
+    parser.add_argument('--topic', help='only this topic')
+    parser.add_argument('--top', type=int, default=10, help='questions to list')
+    args = parser.parse_args()
+
+    attempts = load_attempts(open_result_store(args.store))
+    if args.topic:
+        attempts = attempts[attempts['topic'] == args.topic]
+    if attempts.empty:
+        print("No results found.")
+    else:
+        scores = quiz_scores(attempts)
+        print(f"{len(scores)} quizzes, {len(attempts)} answered questions\n")
+        print("=== Scores by topic ===")
+        print(topic_summary(scores).round(1).to_string())
+        print("\n=== Score distribution ===")
+        print(score_distribution(scores).to_string())
+        print(f"\n=== Hardest {args.top} questions ===")
+        print(question_difficulty(attempts).head(args.top).round(3).to_string())
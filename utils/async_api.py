@@ -0,0 +1,95 @@
+import asyncio
+import functools
+import random
+from concurrent.futures import ThreadPoolExecutor
+from utils.parallel import ParallelQuestionGenerator, create_question_in_worker
+from utils.question import Question
+from utils.quiz_engine import QuizEngine
+
+
+class AsyncQuizService:
+    """
+    asyncio front end over QuizEngine, independent of any UI.
+    The CPU-bound question generation runs in an executor (threads by default,
+    or warm worker processes with use_processes=True), so the event loop never blocks.
+    Each request may hold at most per_request_limit executor slots at a time, so a
+    large quiz cannot queue ahead of every smaller request that arrives after it.
+    """
+
+    def __init__(self, engine: QuizEngine = None, max_workers: int = 4, use_processes: bool = False,
+                 per_request_limit: int = 2, default_timeout: float = None):
+        self.engine = engine or QuizEngine()
+        self.per_request_limit = max(1, per_request_limit)
+        self.default_timeout = default_timeout
+
+        if use_processes:
+            self._generator = ParallelQuestionGenerator(self.engine.content_processor, max_workers)
+            self.executor = self._generator.executor
+            self._create = create_question_in_worker
+            self._item = lambda section: section.id
+        else:
+            self._generator = None
+            self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="quiz")
+            self._create = self.engine.content_processor.create_question
+            self._item = lambda section: section
+
+    async def get_available_topics(self) -> list:
+        return self.engine.get_available_topics()
+
+    async def generate_quiz(self, topic: str, num_questions: int, timeout: float = None,
+                            seed=None, stratify: bool = False, bank_ratio: float = None) -> list:
+        """
+        Generate a quiz without blocking the event loop (same arguments as
+        QuizEngine.generate_quiz). Raises ValueError for an unknown topic and
+        asyncio.TimeoutError if the quiz is not ready within timeout seconds
+        (default_timeout if not given); the deadline covers planning as well as
+        generation. Cancelling the caller cancels every question that has not started yet.
+        """
+        tasks = []
+        try:
+            return await asyncio.wait_for(
+                self._generate(tasks, topic, num_questions, seed, stratify, bank_ratio),
+                timeout if timeout is not None else self.default_timeout
+            )
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _generate(self, tasks: list, topic: str, num_questions: int, seed, stratify: bool,
+                        bank_ratio: float) -> list:
+        loop = asyncio.get_running_loop()
+        # Planning may load the section index and question bank on first use, so it
+        # runs in a thread too
+        plan = await loop.run_in_executor(None, functools.partial(
+            self.engine.plan_quiz, topic, num_questions, seed=seed, stratify=stratify, bank_ratio=bank_ratio
+        ))
+        slots = asyncio.Semaphore(self.per_request_limit)
+        tasks.extend(asyncio.ensure_future(self._generate_one(item, slots))
+                     for item in plan if not isinstance(item, Question))
+        generated = iter(await asyncio.gather(*tasks))
+
+        # A section whose question failed is retried in iter_plan
+        questions = [item if isinstance(item, Question) else next(generated) or item for item in plan]
+        # Same repeated-wording check and replacement draws as the sync API (in a thread,
+        # not on the loop)
+        sampler = self.engine.get_sampler(topic)
+        rng = random.Random(seed) if seed is not None else None
+        return await loop.run_in_executor(None, lambda: list(self.engine.iter_plan(questions, None, sampler, rng)))
+
+    async def _generate_one(self, section, slots: asyncio.Semaphore):
+        async with slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self._create, self._item(section))
+
+    def close(self):
+        """Shut down the executor (pending work is cancelled)"""
+        if self._generator is not None:
+            self._generator.executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
@@ -0,0 +1,210 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from utils.file_lock import file_lock
+from utils.metrics import LatencyStats
+
+_STOP = object()
+
+
+class BackgroundResultWriter:
+    """
+    Writes result records to a ResultStore from a background thread.
+    submit() only enqueues; the worker drains up to batch_size records per save_many
+    call, retrying failed batches with exponential backoff. A batch that still fails is
+    retried one record at a time, and records that cannot be written are appended to
+    spill_path (JSON Lines) and written again when the next writer starts, so one bad
+    record does not sink its batch. The queue is bounded: when it stays full for
+    put_timeout seconds the record is written synchronously instead. Pending records
+    are flushed at interpreter exit.
+
+    on_done(record, written), if given, is called once per record after it is stored
+    (written=True) or spilled (written=False).
+    """
+
+    def __init__(self, store, max_queue: int = 1000, batch_size: int = 50, max_retries: int = 3,
+                 retry_backoff: float = 0.1, put_timeout: float = 0.5, spill_path: str = None,
+                 on_done=None):
+        self.store = store
+        self.spill_path = spill_path
+        self.on_done = on_done
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.put_timeout = put_timeout
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._state = threading.Condition()  # guards _closed and _submitting
+        self._submitting = 0
+        self._stats_lock = threading.Lock()  # overflow writes run on the caller's thread
+        self.flush_latency = LatencyStats()
+        self.written = 0
+        self.batches = 0
+        self.retries = 0
+        self.failed = 0
+        self.spilled = 0
+        self.overflow = 0
+
+        self._thread = threading.Thread(target=self._run, name="result-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, record: dict):
+        """Queue a record for writing"""
+        with self._state:
+            if self._closed:
+                raise RuntimeError("BackgroundResultWriter is closed")
+            self._submitting += 1
+        try:
+            try:
+                self._queue.put(record, timeout=self.put_timeout)
+            except queue.Full:
+                with self._stats_lock:
+                    self.overflow += 1
+                self._write([record])
+        finally:
+            with self._state:
+                self._submitting -= 1
+                self._state.notify_all()
+
+    def flush(self):
+        """Block until every queued record has been written (or spilled)"""
+        self._queue.join()
+
+    def close(self):
+        """Flush pending records and stop the worker thread"""
+        with self._state:
+            if self._closed:
+                return
+            self._closed = True
+            # Let submits already past the closed check enqueue ahead of the stop marker
+            self._state.wait_for(lambda: self._submitting == 0)
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        self._replay_spilled()
+        while True:
+            item = self._queue.get()
+            batch = [] if item is _STOP else [item]
+            stopping = item is _STOP
+            while not stopping and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+
+            if batch:
+                self._write(batch)
+            for _ in range(len(batch) + (1 if stopping else 0)):
+                self._queue.task_done()
+            if stopping:
+                return
+
+    def _write(self, batch: list):
+        start = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.store.save_many(batch)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    print(f"Error saving {len(batch)} quiz results after {attempt + 1} attempts: {e}")
+                    self._write_each(batch)
+                    return
+                with self._stats_lock:
+                    self.retries += 1
+                time.sleep(self.retry_backoff * (2 ** attempt))
+                continue
+            with self._stats_lock:
+                self.written += len(batch)
+                self.batches += 1
+                self.flush_latency.record(time.perf_counter() - start)
+            self._done(batch, True)
+            return
+
+    def _write_each(self, batch: list):
+        """Save records one by one, so a bad record only fails itself; spill the failures"""
+        failed = []
+        for record in batch:
+            try:
+                self.store.save_many([record])
+            except Exception as e:
+                print(f"Error saving quiz result {record.get('quiz_id')}: {e}")
+                failed.append(record)
+                continue
+            with self._stats_lock:
+                self.written += 1
+            self._done([record], True)
+        if failed:
+            with self._stats_lock:
+                self.failed += len(failed)
+            self._spill(failed)
+
+    def _spill(self, records: list):
+        """Append unwritten records to spill_path for the next writer to retry"""
+        if self.spill_path is None:
+            print(f"Lost {len(records)} quiz results (no spill file configured)")
+            return
+        try:
+            with file_lock(self.spill_path):
+                with open(self.spill_path, 'a', encoding='utf-8') as f:
+                    for record in records:
+                        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+        except OSError as e:
+            print(f"Lost {len(records)} quiz results, could not write {self.spill_path}: {e}")
+            return
+        with self._stats_lock:
+            self.spilled += len(records)
+        print(f"Kept {len(records)} unsaved quiz results in {self.spill_path}")
+        self._done(records, False)
+
+    def _replay_spilled(self):
+        """Take over records spilled by an earlier writer and write them again"""
+        if self.spill_path is None or not os.path.exists(self.spill_path):
+            return
+        with file_lock(self.spill_path):
+            try:
+                with open(self.spill_path, 'r', encoding='utf-8') as f:
+                    lines = f.readlines()
+                os.remove(self.spill_path)
+            except FileNotFoundError:
+                return
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                pass  # torn last line from a crash mid-append
+        if records:
+            print(f"Retrying {len(records)} quiz results from {self.spill_path}")
+        for i in range(0, len(records), self.batch_size):
+            self._write(records[i:i + self.batch_size])
+
+    def _done(self, records: list, written: bool):
+        if self.on_done is not None:
+            for record in records:
+                self.on_done(record, written)
+
+    def stats(self) -> dict:
+        return {
+            'queue_depth': self._queue.qsize(),
+            'max_queue': self.max_queue,
+            'written': self.written,
+            'batches': self.batches,
+            'retries': self.retries,
+            'failed': self.failed,
+            'spilled': self.spilled,
+            'overflow': self.overflow,
+            'flush_latency': self.flush_latency.stats()
+        }
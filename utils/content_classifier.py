@@ -0,0 +1,96 @@
+import re
+
+
+def _keyword_alternatives(pattern: str):
+    """Split a '(?:a|b|c)' keyword pattern into its literals, or None if it is not one"""
+    wrapped = re.fullmatch(r'\(\?:([^()]*)\)', pattern)
+    alternatives = (wrapped.group(1) if wrapped else pattern).split('|')
+    if all(re.fullmatch(r'[\w ]+', alternative) for alternative in alternatives):
+        return alternatives
+    return None
+
+
+class ContentClassifier:
+    """
+    Content-type classifier that compiles every pattern into one regex, tried in
+    priority (dict) order at each position. Scanning resumes one character after
+    each match start, so overlapping matches are not skipped, and once a type is
+    found only the higher-priority patterns are searched for. The result is the
+    same as trying the patterns one by one in dict order.
+
+    Keyword patterns (the common case) are flattened into a single alternation
+    and the matched keyword is mapped back to its type, which lets re use its
+    literal-prefix scan; anything else falls back to named groups.
+    """
+
+    def __init__(self, patterns: dict):
+        self.types = tuple(patterns)
+        self._priority = {name: i for i, name in enumerate(self.types)}
+
+        keywords = {name: _keyword_alternatives(pattern) for name, pattern in patterns.items()}
+        if all(keywords.values()):
+            self._keyword_priority = {}
+            for name in reversed(self.types):
+                for keyword in keywords[name]:
+                    self._keyword_priority[keyword] = self._priority[name]
+            parts = ['|'.join(keywords[name]) for name in self.types]
+        else:
+            self._keyword_priority = None
+            parts = [f'(?P<{name}>{pattern})' for name, pattern in patterns.items()]
+
+        # _regexes[i] matches any of the first i + 1 types
+        self._regexes = tuple(re.compile('|'.join(parts[:i + 1])) for i in range(len(parts)))
+
+    def match_type(self, text: str):
+        """Highest-priority pattern type found in text, or None"""
+        text = text.lower()
+        best = len(self.types)
+        pos = 0
+        while best > 0:
+            match = self._regexes[best - 1].search(text, pos)
+            if match is None:
+                break
+            if self._keyword_priority is not None:
+                best = self._keyword_priority[match.group()]
+            else:
+                best = self._priority[match.lastgroup]
+            pos = match.start() + 1
+        return self.types[best] if best < len(self.types) else None
+
+    def classify(self, text: str, processed: dict) -> str:
+        """
+        Identify the type of content using patterns and POS analysis
+        Returns: 'definition', 'example', 'process', 'comparison', 'characteristic' or 'general'
+        """
+        content_type = self.match_type(text)
+        if content_type:
+            return content_type
+
+        # If no pattern matches, count the relevant tags in one pass
+        has_vbz = False
+        nouns = verbs = 0
+        for _, tag in processed['pos_tags']:
+            if tag == 'NN':
+                nouns += 1
+            elif tag == 'VB':
+                verbs += 1
+            elif tag == 'VBZ':
+                has_vbz = True
+
+        if has_vbz and nouns > 2:
+            return 'definition'
+        elif verbs > 2:
+            return 'process'
+
+        return 'general'
+
+    def classify_many(self, sections) -> list:
+        """Classify a list of Section records (or (text, processed) pairs)"""
+        labels = []
+        for section in sections:
+            if hasattr(section, 'processed'):
+                text, processed = section.text, section.processed
+            else:
+                text, processed = section
+            labels.append(self.classify(text, processed))
+        return labels
@@ -1,26 +1,43 @@
+import hashlib
 import random
+import threading
+import time
 from collections import defaultdict
-import nltk
 from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-from nltk.tag import pos_tag
-import re
+from types import MappingProxyType
+from utils.content_classifier import ContentClassifier
+from utils.distractors import DistractorEngine
+from utils.embeddings import EmbeddingIndex, build_embedding_index
+from utils.lru_cache import LRUCache
+from utils.question import Question
+from utils.question_bank import QuestionBank
+from utils.nltk_resources import ensure_nltk_resources, get_stop_words, get_tagger
+from utils.section_index import Section, load_or_build_section_index
+
+# Wrong options are drawn at random from this many most-similar sections
+DISTRACTOR_POOL = 6
+
 
 class ContentProcessor:
-    def __init__(self):
+    def __init__(self, data_dir: str = None, cache_size: int = 1024):
         print("Initializing Content Processor...")
-        # Download required NLTK data (only needed once)
-        try:
-            # Download necessary NLTK components
-            nltk.download('punkt')     # For tokenization
-            nltk.download('averaged_perceptron_tagger')  # For POS tagging
-            nltk.download('stopwords')  # For removing common words
-        except Exception as e:
-            print(f"Warning: NLTK download failed: {e}")
+        start = time.perf_counter()
+
+        # Load NLTK data from local disk only (checked once per process)
+        self.startup_report = ensure_nltk_resources(data_dir)
 
         # Initialize NLP tools and patterns
-        self.stop_words = set(stopwords.words('english'))
+        self.stop_words = get_stop_words()
+        self.tagger = get_tagger()
         self.content = {}
+        self._section_index = None
+        self._index_lock = threading.Lock()
+        self._distractors = None
+        self._embeddings = None
+        self._similarity_lock = threading.Lock()
+        self._question_bank = None
+        # Processed sections keyed by content hash
+        self.text_cache = LRUCache(cache_size)
 
         # Patterns for different types of content
         self.patterns = {
@@ -30,13 +47,58 @@ class ContentProcessor:
             'comparison': r'(?:compared to|versus|whereas|while)',
             'characteristic': r'(?:features|properties|attributes)'
         }
+        self.classifier = ContentClassifier(self.patterns)
 
         self.load_content()
+        self.init_seconds = time.perf_counter() - start
+        print(f"Content Processor ready in {self.init_seconds * 1000:.1f} ms")
 
     def load_content(self):
         """Load content from content_database.py"""
         from content_database import COMPUTING_CONTENT
-        self.content = COMPUTING_CONTENT
+        # Read-only view: the processor is shared across sessions and threads
+        self.content = MappingProxyType(COMPUTING_CONTENT)
+
+    @property
+    def section_index(self):
+        """Precomputed SectionIndex, loaded from disk or built on first use"""
+        if self._section_index is None:
+            with self._index_lock:
+                if self._section_index is None:
+                    self._section_index = load_or_build_section_index(self)
+        return self._section_index
+
+    @property
+    def distractors(self) -> DistractorEngine:
+        """TF-IDF similarity over every indexed section, built on first use"""
+        if self._distractors is None:
+            with self._similarity_lock:
+                if self._distractors is None:
+                    self._distractors = DistractorEngine(self.section_index.sections)
+        return self._distractors
+
+    @property
+    def embeddings(self) -> EmbeddingIndex:
+        """
+        Hashed sentence vectors for every section (row i = section i) and every
+        TRAINING_DATA answer, built on first use
+        """
+        if self._embeddings is None:
+            bank = self.question_bank
+            with self._similarity_lock:
+                if self._embeddings is None:
+                    self._embeddings = build_embedding_index(
+                        self.section_index.sections, bank.items, self.stop_words)
+        return self._embeddings
+
+    @property
+    def question_bank(self) -> QuestionBank:
+        """Curated TRAINING_DATA questions (duplicate keys merged), loaded on first use"""
+        if self._question_bank is None:
+            with self._index_lock:
+                if self._question_bank is None:
+                    self._question_bank = QuestionBank.load()
+        return self._question_bank
 
     def _process_text(self, text: str) -> dict:
         """
@@ -46,42 +108,15 @@ class ContentProcessor:
         - words: List of important words (excluding stop words)
         - pos_tags: List of (word, POS tag) pairs
         - key_terms: Set of important terms
+        Results are cached by content hash and shared, so treat them as read-only.
         """
-        try:
-            # Split text into sentences
-            sentences = sent_tokenize(text)
-
-            # Process each sentence
-            all_words = []
-            all_pos_tags = []
-            key_terms = set()
-
-            for sentence in sentences:
-                # Tokenize words
-                words = word_tokenize(sentence)
+        key = hashlib.sha1(text.encode('utf-8')).digest()
+        processed = self.text_cache.get(key)
+        if processed is not None:
+            return processed
 
-                # Remove stop words and punctuation
-                words = [word for word in words
-                        if word.lower() not in self.stop_words
-                        and word.isalnum()]
-
-                # Get POS tags
-                pos_tags = pos_tag(words)
-
-                # Collect important terms based on POS tags
-                for word, tag in pos_tags:
-                    if tag.startswith(('NN', 'VB', 'JJ')):  # Nouns, Verbs, Adjectives
-                        key_terms.add(word)
-
-                all_words.extend(words)
-                all_pos_tags.extend(pos_tags)
-
-            return {
-                'sentences': sentences,
-                'words': all_words,
-                'pos_tags': all_pos_tags,
-                'key_terms': key_terms
-            }
+        try:
+            processed = self._analyze_text(text)
         except Exception as e:
             print(f"Error processing text: {e}")
             return {
@@ -91,14 +126,118 @@ class ContentProcessor:
                 'key_terms': set()
             }
 
-    def create_question(self, section: str) -> dict:
-        """Generate a question from the given section using NLP analysis"""
+        self.text_cache.put(key, processed)
+        return processed
+
+    def _analyze_text(self, text: str) -> dict:
+        """Run the NLTK pipeline on text (uncached)"""
+        sentences, word_lists = self._tokenize_text(text)
+        return self._build_processed(sentences, word_lists, self.tagger.tag_sents(word_lists))
+
+    def _tokenize_text(self, text: str) -> tuple:
+        """Split text into sentences and filtered word lists (one per sentence)"""
+        # Split text into sentences
+        sentences = sent_tokenize(text)
+
+        word_lists = []
+        for sentence in sentences:
+            # Tokenize words
+            words = word_tokenize(sentence)
+
+            # Remove stop words and punctuation
+            word_lists.append([word for word in words
+                               if word.lower() not in self.stop_words
+                               and word.isalnum()])
+
+        return sentences, word_lists
+
+    def _build_processed(self, sentences, word_lists, tag_lists) -> dict:
+        """Combine per-sentence words and POS tags into a processed-text record"""
+        all_words = []
+        all_pos_tags = []
+        key_terms = set()
+
+        for words, pos_tags in zip(word_lists, tag_lists):
+            # Collect important terms based on POS tags
+            for word, tag in pos_tags:
+                if tag.startswith(('NN', 'VB', 'JJ')):  # Nouns, Verbs, Adjectives
+                    key_terms.add(word)
+
+            all_words.extend(words)
+            all_pos_tags.extend(pos_tags)
+
+        return {
+            'sentences': tuple(sentences),
+            'words': tuple(all_words),
+            'pos_tags': tuple(all_pos_tags),
+            'key_terms': frozenset(key_terms)
+        }
+
+    def process_batch(self, texts: list) -> list:
+        """
+        Process many sections at once: every uncached sentence across all of them
+        is POS-tagged in a single bulk call, then results are split back per section.
+        Returns one processed dict per input text, in order.
+        """
+        results = [None] * len(texts)
+        pending = []  # (position, cache key, sentences, word lists)
+
+        for i, text in enumerate(texts):
+            key = hashlib.sha1(text.encode('utf-8')).digest()
+            cached = self.text_cache.get(key)
+            if cached is not None:
+                results[i] = cached
+                continue
+            try:
+                sentences, word_lists = self._tokenize_text(text)
+            except Exception as e:
+                print(f"Error processing text: {e}")
+                results[i] = self._process_text(text)
+                continue
+            pending.append((i, key, sentences, word_lists))
+
+        if not pending:
+            return results
+
+        try:
+            tagged = self.tagger.tag_sents([words for *_, word_lists in pending for words in word_lists])
+        except Exception as e:
+            print(f"Error in batch tagging, falling back to per-section processing: {e}")
+            for i, *_ in pending:
+                results[i] = self._process_text(texts[i])
+            return results
+
+        offset = 0
+        for i, key, sentences, word_lists in pending:
+            tag_lists = tagged[offset:offset + len(word_lists)]
+            offset += len(word_lists)
+            processed = self._build_processed(sentences, word_lists, tag_lists)
+            self.text_cache.put(key, processed)
+            results[i] = processed
+
+        return results
+
+    def cache_stats(self) -> dict:
+        """Hit, miss and eviction counters for the processed-text cache"""
+        return self.text_cache.stats()
+
+    def create_question(self, section) -> Question:
+        """
+        Generate a question from the given section using NLP analysis.
+        section may be raw text or an indexed Section (which skips NLP processing).
+        """
         try:
             # Process the text
-            processed = self._process_text(section)
-
-            # Determine the content type
-            content_type = self._identify_content_type(section, processed)
+            section_id = None
+            if isinstance(section, Section):
+                processed = section.processed
+                content_type = section.content_type
+                section_id = section.id
+                section = section.text
+            else:
+                processed = self._process_text(section)
+                # Determine the content type
+                content_type = self._identify_content_type(section, processed)
 
             # Get main concepts
             main_concept = self._get_main_concept(processed)
@@ -107,17 +246,14 @@ class ContentProcessor:
             question = self._generate_question(main_concept, content_type)
 
             # Generate options
-            wrong_options = self._generate_wrong_options(main_concept, content_type, processed)
+            wrong_options = self._generate_wrong_options(main_concept, content_type, processed,
+                                                         section, section_id)
 
             # Combine and shuffle options
             options = [section] + wrong_options
             random.shuffle(options)
 
-            return {
-                'question': question,
-                'options': options,
-                'correct_answer': section
-            }
+            return Question(question, options, options.index(section), section_id)
         except Exception as e:
             print(f"Error creating question: {e}")
             return None
@@ -125,24 +261,9 @@ class ContentProcessor:
     def _identify_content_type(self, text: str, processed: dict) -> str:
         """
         Identify the type of content using patterns and POS analysis
-        Returns: 'definition', 'example', 'process', 'comparison', or 'general'
+        Returns: 'definition', 'example', 'process', 'comparison', 'characteristic' or 'general'
         """
-        text_lower = text.lower()
-
-        # Check each pattern
-        for content_type, pattern in self.patterns.items():
-            if re.search(pattern, text_lower):
-                return content_type
-
-        # If no pattern matches, analyze POS tags
-        pos_sequence = [tag for _, tag in processed['pos_tags']]
-
-        if 'VBZ' in pos_sequence and pos_sequence.count('NN') > 2:
-            return 'definition'
-        elif pos_sequence.count('VB') > 2:
-            return 'process'
-
-        return 'general'
+        return self.classifier.classify(text, processed)
 
     def _get_main_concept(self, processed: dict) -> str:
         """Extract the main concept from processed text"""
@@ -197,9 +318,25 @@ class ContentProcessor:
 
         return random.choice(templates.get(content_type, templates['general']))
 
-    def _generate_wrong_options(self, concept: str, content_type: str, processed: dict) -> list:
-        """Generate wrong options based on content type and analysis"""
-        wrong_options = []
+    def _generate_wrong_options(self, concept: str, content_type: str, processed: dict,
+                                text: str = None, section_id: int = None) -> list:
+        """
+        Wrong options are other sections similar to the correct one (picked at random
+        from the DISTRACTOR_POOL nearest), skipping any the embedding index sees as a
+        restatement of the answer or of another option. Topped up from templates if
+        too few are found.
+        """
+        if section_id is not None:
+            similar = self.distractors.nearest(section_id, DISTRACTOR_POOL)
+            anchor = self.embeddings.matrix[section_id]
+        else:
+            similar = self.distractors.nearest_to_words(processed['words'], DISTRACTOR_POOL, text)
+            anchor = self.embeddings.embedder.embed([text or ' '.join(processed['words'])])[0]
+        random.shuffle(similar)
+        sections = self.distractors.sections
+        wrong_options = [sections[i].text for i in self.embeddings.pick_distinct(similar, 3, anchor)]
+        if len(wrong_options) == 3:
+            return wrong_options
 
         # Get some key terms for variation
         key_terms = list(processed['key_terms'])
@@ -240,34 +377,13 @@ class ContentProcessor:
 
     def get_content_sections(self, topic: str) -> list:
         """Split content into meaningful sections"""
-        content = self.content.get(topic.lower())
-        if not content:
-            return []
-
-        # Split into sections
-        sections = []
-        current_section = []
-
-        for line in content.split('\n'):
-            line = line.strip()
-            if not line:
-                if current_section:
-                    sections.append(' '.join(current_section))
-                    current_section = []
-            elif line.endswith(':'):
-                if current_section:
-                    sections.append(' '.join(current_section))
-                current_section = [line]
-            elif line.startswith('-'):
-                sections.append(line[1:].strip())
-            else:
-                current_section.append(line)
-
-        if current_section:
-            sections.append(' '.join(current_section))
+        return [section.text for section in self.get_sections(topic)]
 
-        # Filter out very short sections
-        return [s for s in sections if len(s.split()) > 5]
+    def get_sections(self, topic: str) -> tuple:
+        """Indexed Section records for a topic"""
+        if topic.lower() not in self.content:
+            return ()
+        return self.section_index.get(topic)
 
     def get_available_topics(self) -> list:
         """Get list of available topics"""
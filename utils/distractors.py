@@ -0,0 +1,98 @@
+import math
+from collections import Counter
+import numpy as np
+
+
+class DistractorEngine:
+    """
+    TF-IDF vectors for every section, stored as a sparse CSR matrix in numpy arrays
+    (plus its transpose, for term -> sections lookups). Wrong options for a question
+    are the sections most similar to the correct one by cosine similarity: plausible,
+    on the same subject, but a different section. Sections that are near-copies of
+    the answer (similarity >= max_similarity) are never offered.
+    """
+
+    def __init__(self, sections, max_similarity: float = 0.9):
+        self.sections = tuple(sections)
+        self.max_similarity = max_similarity
+        self.vocabulary = {}
+        self._ids_by_text = {}
+        self._cluster_members = {}
+        for i, section in enumerate(self.sections):
+            self._ids_by_text.setdefault(section.text, []).append(i)
+            self._cluster_members.setdefault(section.cluster, []).append(i)
+
+        counts = [Counter(self.vocabulary.setdefault(w.lower(), len(self.vocabulary)) for w in s.words)
+                  for s in self.sections]
+        n = len(self.sections)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(c) for c in counts])
+        indices = np.fromiter((t for c in counts for t in c), dtype=np.int32, count=indptr[-1])
+        tf = np.fromiter((f for c in counts for f in c.values()), dtype=np.float32, count=indptr[-1])
+
+        df = np.bincount(indices, minlength=len(self.vocabulary))
+        self.idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+        data = (1 + np.log(tf)) * self.idf[indices]
+        rows = np.repeat(np.arange(n, dtype=np.int32), np.diff(indptr))
+        norms = np.sqrt(np.bincount(rows, data * data, minlength=n))
+        data /= np.where(norms > 0, norms, 1)[rows]
+
+        # CSR: row i's terms are indices[indptr[i]:indptr[i+1]] with weights data[...]
+        self.indptr, self.indices, self.data = indptr, indices, data.astype(np.float32)
+        # Transposed (CSC) copy: the sections containing each term
+        order = np.argsort(indices, kind='stable')
+        self.col_indptr = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        self.col_indptr[1:] = np.cumsum(df)
+        self.col_rows = rows[order]
+        self.col_data = self.data[order]
+
+    def __len__(self):
+        return len(self.sections)
+
+    def _similarities(self, terms: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Cosine similarity of a normalized sparse vector with every section"""
+        starts = self.col_indptr[terms]
+        lengths = self.col_indptr[terms + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.zeros(len(self.sections), dtype=np.float32)
+        # Positions of every (term, section) entry in the CSC arrays, gathered in one go
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        return np.bincount(self.col_rows[offsets], self.col_data[offsets] * np.repeat(weights, lengths),
+                           minlength=len(self.sections))
+
+    def similarities(self, section_id: int) -> np.ndarray:
+        start, end = self.indptr[section_id], self.indptr[section_id + 1]
+        return self._similarities(self.indices[start:end], self.data[start:end])
+
+    def similarities_to_words(self, words) -> np.ndarray:
+        """Cosine similarity of arbitrary text (as a word list) with every section"""
+        counts = Counter(self.vocabulary[w.lower()] for w in words if w.lower() in self.vocabulary)
+        if not counts:
+            return np.zeros(len(self.sections), dtype=np.float32)
+        terms = np.fromiter(counts, dtype=np.int64, count=len(counts))
+        weights = np.array([1 + math.log(f) for f in counts.values()], dtype=np.float32) * self.idf[terms]
+        return self._similarities(terms, weights / np.linalg.norm(weights))
+
+    def nearest(self, section_id: int, k: int = 3) -> list:
+        """
+        Ids of the k sections most similar to section_id, most similar first
+        (never one from the same near-duplicate cluster)
+        """
+        scores = self.similarities(section_id)
+        scores[self._cluster_members.get(self.sections[section_id].cluster, [section_id])] = -np.inf
+        return self._top(scores, k, self.sections[section_id].text)
+
+    def nearest_to_words(self, words, k: int = 3, text: str = None) -> list:
+        return self._top(self.similarities_to_words(words), k, text)
+
+    def _top(self, scores: np.ndarray, k: int, text: str = None) -> list:
+        scores = np.asarray(scores, dtype=np.float64)
+        scores[scores >= self.max_similarity] = -np.inf
+        scores[self._ids_by_text.get(text, [])] = -np.inf
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        ranked = top[np.argsort(-scores[top], kind='stable')]
+        return [int(i) for i in ranked]
@@ -0,0 +1,171 @@
+"""
+Offline sentence vectors using the hashing trick: words, word bigrams and character
+trigrams are hashed into a fixed number of signed buckets, so no model download or
+training is needed and vectors are reproducible across processes.
+
+    python -m utils.embeddings duplicates [--threshold 0.85]
+"""
+import argparse
+import math
+import re
+import zlib
+from collections import Counter
+import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Cosine similarity at or above which two texts are treated as saying the same thing
+DUPLICATE_THRESHOLD = 0.85
+
+
+class HashedEmbedder:
+    """Maps text to L2-normalized float32 vectors of length dim"""
+
+    def __init__(self, dim: int = 1024, stop_words=frozenset()):
+        self.dim = dim
+        self.stop_words = stop_words
+        self._buckets = {}  # feature -> (bucket, sign); crc32 is stable across runs, unlike hash()
+
+    def features(self, text: str) -> list:
+        words = [w for w in _TOKEN.findall(text.lower()) if w not in self.stop_words]
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"#{word}#"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return features
+
+    def _bucket(self, feature: str) -> tuple:
+        bucket = self._buckets.get(feature)
+        if bucket is None:
+            h = zlib.crc32(feature.encode('utf-8'))
+            bucket = self._buckets[feature] = (h % self.dim, 1.0 if h & 0x80000000 else -1.0)
+        return bucket
+
+    def embed(self, texts) -> np.ndarray:
+        """One row per text"""
+        texts = list(texts)
+        rows, cols, values = [], [], []
+        for row, text in enumerate(texts):
+            for feature, count in Counter(self.features(text)).items():
+                bucket, sign = self._bucket(feature)
+                rows.append(row)
+                cols.append(bucket)
+                values.append(sign * (1 + math.log(count)))
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(matrix, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)),
+                  np.asarray(values, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms > 0, norms, 1)
+        return matrix
+
+
+class EmbeddingIndex:
+    """
+    Vectors for a fixed set of texts, each tagged with a kind ('section' or 'answer')
+    and a key identifying where it came from. Rows are unit length, so one matrix
+    product scores a whole batch of queries against everything.
+    """
+
+    def __init__(self, texts, kinds, keys, embedder: HashedEmbedder):
+        self.texts = tuple(texts)
+        self.kinds = np.asarray(kinds)
+        self.keys = tuple(keys)
+        self.embedder = embedder
+        self.matrix = embedder.embed(self.texts)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def search(self, queries: np.ndarray, k: int = 5, kind: str = None) -> list:
+        """
+        Top-k rows for each query vector, as lists of (row, score), best first.
+        kind restricts results to rows of that kind.
+        """
+        queries = np.atleast_2d(queries)
+        scores = queries @ self.matrix.T
+        if kind is not None:
+            scores[:, self.kinds != kind] = -np.inf
+        k = min(k, scores.shape[1])
+        if k <= 0:
+            return [[] for _ in range(len(queries))]
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        return [[(int(i), float(s)) for i, s in zip(rows, row_scores) if np.isfinite(s)]
+                for rows, row_scores in zip(top, top_scores)]
+
+    def search_texts(self, texts, k: int = 5, kind: str = None) -> list:
+        return self.search(self.embedder.embed(texts), k, kind)
+
+    def pick_distinct(self, candidates, k: int, anchor: np.ndarray = None,
+                      threshold: float = DUPLICATE_THRESHOLD) -> list:
+        """
+        Up to k candidate rows, in order, skipping any that near-duplicate the anchor
+        vector (e.g. the correct answer) or a row already picked
+        """
+        candidates = list(candidates)
+        if not candidates:
+            return []
+        vectors = self.matrix[candidates]
+        blocked = vectors @ anchor >= threshold if anchor is not None else np.zeros(len(candidates), bool)
+        pairwise = vectors @ vectors.T
+        picked = []
+        for i, row in enumerate(candidates):
+            if blocked[i]:
+                continue
+            picked.append(row)
+            if len(picked) == k:
+                break
+            blocked |= pairwise[i] >= threshold
+        return picked
+
+    def duplicates(self, threshold: float = DUPLICATE_THRESHOLD, block: int = 512) -> list:
+        """All pairs (i, j, score) with i < j and cosine >= threshold, scored block by block"""
+        pairs = []
+        for start in range(0, len(self.texts), block):
+            scores = self.matrix[start:start + block] @ self.matrix.T
+            rows, cols = np.nonzero(scores >= threshold)
+            for i, j in zip(rows + start, cols):
+                if i < j:
+                    pairs.append((int(i), int(j), float(scores[i - start, j])))
+        return sorted(pairs, key=lambda pair: -pair[2])
+
+
+def build_embedding_index(sections, training_data: dict, stop_words=frozenset(),
+                          dim: int = 1024) -> EmbeddingIndex:
+    """
+    Index every section (row i is section i, key = section id) followed by every
+    TRAINING_DATA answer (key = (topic, item number, 'correct' or wrong-answer number))
+    """
+    texts, kinds, keys = [], [], []
+    for section in sections:
+        texts.append(section.text)
+        kinds.append('section')
+        keys.append(section.id)
+    for topic, items in training_data.items():
+        for n, item in enumerate(items):
+            texts.append(item['correct_answer'])
+            kinds.append('answer')
+            keys.append((topic, n, 'correct'))
+            for w, wrong in enumerate(item.get('wrong_answers', [])):
+                texts.append(wrong)
+                kinds.append('answer')
+                keys.append((topic, n, w))
+    return EmbeddingIndex(texts, kinds, keys, HashedEmbedder(dim, stop_words))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embedding index tools")
+    parser.add_argument('command', choices=['duplicates'])
+    parser.add_argument('--threshold', type=float, default=DUPLICATE_THRESHOLD)
+    args = parser.parse_args()
+
+    from utils.content_processor import ContentProcessor
+    index = ContentProcessor().embeddings
+    pairs = index.duplicates(args.threshold)
+    print(f"{len(pairs)} near-duplicate pairs among {len(index)} texts (cosine >= {args.threshold})")
+    for i, j, score in pairs:
+        print(f"\n{score:.3f}  [{index.kinds[i]} {index.keys[i]}] {index.texts[i][:90]}")
+        print(f"       [{index.kinds[j]} {index.keys[j]}] {index.texts[j][:90]}")
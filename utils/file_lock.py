@@ -0,0 +1,54 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path: str, shared: bool = False):
+    """
+    Advisory inter-process lock on path + '.lock' (held for the duration of the block).
+    shared=True allows concurrent holders where the platform supports it (POSIX only).
+    """
+    fd = os.open(f"{path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: str, data: str, encoding: str = 'utf-8'):
+    """Write data to path via a temp file and rename, so readers never see a partial file"""
+    directory = os.path.dirname(path) or '.'
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding=encoding) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_json(path: str, obj, **dump_kwargs):
+    atomic_write(path, json.dumps(obj, **dump_kwargs))
@@ -0,0 +1,35 @@
+import threading
+from collections import deque
+
+
+class LatencyStats:
+    """Running latency summary over the most recent samples (in seconds)"""
+
+    def __init__(self, window: int = 1000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+
+    def percentile(self, pct: float) -> float:
+        """pct-th percentile (0-100) of the recent window, nearest-rank"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return 0.0
+        rank = max(0, min(len(samples) - 1, int(round(pct / 100 * len(samples))) - 1))
+        return samples[rank]
+
+    def stats(self) -> dict:
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(50) * 1000,
+            'p99_ms': self.percentile(99) * 1000
+        }
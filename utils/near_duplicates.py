@@ -0,0 +1,68 @@
+"""
+Near-duplicate detection with MinHash signatures over word shingles and LSH banding.
+
+Each text gets num_perm min-hashes of its word 3-grams; the fraction of equal
+min-hashes between two texts estimates their Jaccard similarity. Signatures are cut
+into bands and texts sharing any whole band land in the same bucket, so only those
+candidate pairs are compared: the work grows with the corpus, not with its square.
+"""
+import re
+import zlib
+import numpy as np
+
+_TOKEN = re.compile(r"\w+")
+_PRIME = (1 << 31) - 1  # a * h stays below 2**62, so uint64 arithmetic never overflows
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=(num_perm, 1)).astype(np.uint64)
+        self._b = rng.randint(0, _PRIME, size=(num_perm, 1)).astype(np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        """Hashes of the text's word n-grams (the whole text if it is shorter than n words)"""
+        words = _TOKEN.findall(text.lower())
+        n = self.shingle_size
+        grams = {' '.join(words[i:i + n]) for i in range(max(len(words) - n + 1, 1))}
+        return np.fromiter((zlib.crc32(g.encode('utf-8')) % _PRIME for g in grams),
+                           dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> np.ndarray:
+        return ((self._a * self.shingles(text) + self._b) % _PRIME).min(axis=1)
+
+    def signatures(self, texts) -> np.ndarray:
+        """One row of num_perm min-hashes per text"""
+        return np.array([self.signature(text) for text in texts], dtype=np.uint64).reshape(-1, self.num_perm)
+
+
+def cluster_near_duplicates(texts, threshold: float = 0.7, num_perm: int = 64, bands: int = 16) -> list:
+    """
+    Cluster id for each text: texts whose estimated Jaccard similarity is at least
+    threshold (directly or through a chain of such pairs) share a cluster, identified
+    by the position of its first member. Unique texts are their own cluster.
+    """
+    signatures = MinHasher(num_perm).signatures(texts)
+    rows = num_perm // bands
+    parent = list(range(len(signatures)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        buckets = {}
+        for i, key in enumerate(signatures[:, band * rows:(band + 1) * rows]):
+            buckets.setdefault(key.tobytes(), []).append(i)
+        for members in buckets.values():
+            first = members[0]
+            for other in members[1:]:
+                root_a, root_b = find(first), find(other)
+                if root_a != root_b and np.mean(signatures[first] == signatures[other]) >= threshold:
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    return [find(i) for i in range(len(signatures))]
@@ -0,0 +1,135 @@
+import os
+import sys
+import threading
+import time
+import nltk
+from nltk.tag.perceptron import PerceptronTagger
+from nltk.tokenize import sent_tokenize, word_tokenize
+
+# Environment variable pointing at a local nltk_data directory
+NLTK_DATA_ENV = 'QUIZ_NLTK_DATA'
+
+# Cold start (finding, loading and warming every resource) must fit in this budget
+STARTUP_BUDGET_SECONDS = 2.0
+
+# Resources the content processor needs; newer NLTK releases ship the
+# tokenizer and tagger under the names listed second
+REQUIRED_RESOURCES = {
+    'punkt': ('tokenizers/punkt', 'tokenizers/punkt_tab'),
+    'averaged_perceptron_tagger': ('taggers/averaged_perceptron_tagger',
+                                   'taggers/averaged_perceptron_tagger_eng'),
+    'stopwords': ('corpora/stopwords',),
+}
+
+
+class NLTKResourceError(RuntimeError):
+    """Raised when required NLTK data is not available locally"""
+
+
+class StartupReport:
+    def __init__(self, data_dir, elapsed: float):
+        self.data_dir = data_dir
+        self.elapsed = elapsed
+        self.budget = STARTUP_BUDGET_SECONDS
+
+    @property
+    def within_budget(self) -> bool:
+        return self.elapsed <= self.budget
+
+    def __str__(self):
+        status = "within" if self.within_budget else "OVER"
+        return (f"NLTK resources loaded in {self.elapsed * 1000:.1f} ms "
+                f"({status} {self.budget * 1000:.0f} ms budget)")
+
+
+_lock = threading.Lock()
+_report = None
+_tagger = None
+_stop_words = None
+
+
+def _missing_resources() -> list:
+    """Return the resource names that cannot be found on nltk.data.path"""
+    missing = []
+    for name, paths in REQUIRED_RESOURCES.items():
+        for path in paths:
+            try:
+                nltk.data.find(path)
+                break
+            except LookupError:
+                continue
+        else:
+            missing.append(name)
+    return missing
+
+
+def ensure_nltk_resources(data_dir: str = None) -> StartupReport:
+    """
+    Locate and load NLTK resources once per process without touching the network.
+    data_dir (or $QUIZ_NLTK_DATA) is searched before NLTK's default locations.
+    Raises NLTKResourceError if anything is missing.
+    """
+    global _report, _tagger, _stop_words
+
+    with _lock:
+        if _report is not None:
+            return _report
+
+        start = time.perf_counter()
+        data_dir = data_dir or os.environ.get(NLTK_DATA_ENV)
+        if data_dir:
+            if not os.path.isdir(data_dir):
+                raise NLTKResourceError(f"NLTK data directory not found: {data_dir}")
+            if data_dir not in nltk.data.path:
+                nltk.data.path.insert(0, data_dir)
+
+        missing = _missing_resources()
+        if missing:
+            raise NLTKResourceError(
+                f"Missing NLTK resources: {', '.join(missing)}. "
+                f"Searched: {', '.join(nltk.data.path)}. "
+                f"Run 'python -m utils.nltk_resources <dir>' on a machine with network "
+                f"access and point {NLTK_DATA_ENV} at that directory."
+            )
+
+        try:
+            # Load everything now so the first quiz does not pay for it
+            from nltk.corpus import stopwords
+            _stop_words = frozenset(stopwords.words('english'))
+            _tagger = PerceptronTagger()
+            _tagger.tag(word_tokenize(sent_tokenize("Warm up the tokenizer. And the tagger.")[0]))
+        except LookupError as e:
+            raise NLTKResourceError(f"NLTK resources found but could not be loaded: {e}") from e
+
+        _report = StartupReport(data_dir, time.perf_counter() - start)
+        print(_report)
+        if not _report.within_budget:
+            print(f"Warning: NLTK startup exceeded its {STARTUP_BUDGET_SECONDS}s budget")
+        return _report
+
+
+def get_tagger() -> PerceptronTagger:
+    """Process-wide POS tagger (nltk.pos_tag reloads the model on every call)"""
+    ensure_nltk_resources()
+    return _tagger
+
+
+def get_stop_words() -> frozenset:
+    """Process-wide English stopword set"""
+    ensure_nltk_resources()
+    return _stop_words
+
+
+def download_resources(data_dir: str):
+    """Fetch every required resource into data_dir (the only step that uses the network)"""
+    for name, paths in REQUIRED_RESOURCES.items():
+        for path in paths:
+            nltk.download(path.split('/')[-1], download_dir=data_dir)
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else os.environ.get(NLTK_DATA_ENV)
+    if not target:
+        print(f"Usage: python -m utils.nltk_resources <data_dir>  (or set {NLTK_DATA_ENV})")
+        sys.exit(1)
+    download_resources(target)
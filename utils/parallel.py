@@ -0,0 +1,65 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from utils.content_processor import ContentProcessor
+from utils.section_index import Section
+
+# Per-worker state, set once by _init_worker
+_worker_processor = None
+
+
+def _init_worker(data_dir, index_hash):
+    """
+    Load NLTK resources, the section index and the distractor and embedding indexes
+    (which parse the question bank) once when a worker starts
+    """
+    global _worker_processor
+    _worker_processor = ContentProcessor(data_dir)
+    if _worker_processor.section_index.content_hash != index_hash:
+        raise RuntimeError("Worker section index does not match the parent process")
+    _worker_processor.distractors
+    _worker_processor.embeddings
+
+
+def _ping(_):
+    return os.getpid()
+
+
+def create_question_in_worker(item):
+    """item is a section id (looked up in the worker's index) or raw section text"""
+    if isinstance(item, int):
+        item = _worker_processor.section_index.sections[item]
+    return _worker_processor.create_question(item)
+
+
+class ParallelQuestionGenerator:
+    """
+    Generates questions across a pool of warm worker processes.
+    Indexed sections are sent by id; raw texts are processed in the worker.
+    Results come back in input order.
+    """
+
+    def __init__(self, processor: ContentProcessor, workers: int = None, chunksize: int = 8):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(processor.startup_report.data_dir, processor.section_index.content_hash)
+        )
+        # Start every worker now so the first job does not pay for initialization
+        list(self.executor.map(_ping, range(self.workers)))
+
+    def generate(self, sections) -> list:
+        """One Question (or None on failure) per section, in order"""
+        items = [s.id if isinstance(s, Section) else s for s in sections]
+        chunksize = max(1, min(self.chunksize, len(items) // (self.workers * 4) or 1))
+        return list(self.executor.map(create_question_in_worker, items, chunksize=chunksize))
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,62 @@
+import sys
+
+
+class Question:
+    """
+    A multiple-choice question. Options are interned strings, so a section text or
+    distractor that appears in many quizzes and sessions is held once in memory; the
+    answer is stored as an option index and grading is an integer compare.
+
+    Supports q['question'], q['options'] and q['correct_answer'] for code written
+    against the old question dicts.
+    """
+    __slots__ = ('question', 'options', 'correct_index', 'section_id')
+
+    def __init__(self, question: str, options, correct_index: int, section_id: int = None):
+        self.question = sys.intern(question)
+        self.options = tuple(sys.intern(option) for option in options)
+        self.correct_index = correct_index
+        self.section_id = section_id
+
+    @property
+    def correct_answer(self) -> str:
+        return self.options[self.correct_index]
+
+    def is_correct(self, choice) -> bool:
+        """choice is an option index (None for unanswered)"""
+        return choice == self.correct_index
+
+    def __getitem__(self, key: str):
+        if key in ('question', 'options', 'correct_answer'):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __reduce__(self):
+        # Rebuild through __init__ so unpickled questions (e.g. from worker processes) are re-interned
+        return Question, (self.question, self.options, self.correct_index, self.section_id)
+
+    def __repr__(self):
+        return f"Question({self.question!r}, {len(self.options)} options, correct={self.correct_index})"
+
+    def to_record(self) -> dict:
+        """JSON form used in saved results"""
+        return {
+            'question': self.question,
+            'options': list(self.options),
+            'correct_index': self.correct_index
+        }
+
+    @classmethod
+    def from_record(cls, record: dict) -> 'Question':
+        """Build from a saved record or an old-style dict with correct_answer text"""
+        options = record['options']
+        if 'correct_index' in record:
+            correct_index = record['correct_index']
+        else:
+            correct_index = list(options).index(record['correct_answer'])
+        return cls(record['question'], options, correct_index, record.get('section_id'))
+
+
+def as_question(question) -> Question:
+    """Accept a Question or an old-style question dict"""
+    return question if isinstance(question, Question) else Question.from_record(question)
@@ -0,0 +1,124 @@
+"""
+Curated questions from content_database.TRAINING_DATA.
+
+TRAINING_DATA is read from the source with `ast` rather than imported: a dict literal
+that repeats a key (it has two "algorithms" and two "data_structures" entries) silently
+keeps only the last one on import, so the source is the only place the earlier entries
+survive. Repeated keys are merged and reported.
+
+    python -m utils.question_bank
+"""
+import ast
+import hashlib
+import os
+import random
+from types import MappingProxyType
+from utils.question import Question
+from utils.sampling import sample_positions
+
+CONTENT_DATABASE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'content_database.py')
+
+
+def context_hash(context: str) -> str:
+    """Key for a TRAINING_DATA item: its context text, whitespace- and case-normalized"""
+    return hashlib.sha1(' '.join(context.lower().split()).encode('utf-8')).hexdigest()
+
+
+def load_training_data(path: str = CONTENT_DATABASE, name: str = 'TRAINING_DATA') -> tuple:
+    """
+    Parse the `name` dict literal from path. Returns (data, duplicate_keys) where data
+    maps each topic to the items of every occurrence of its key, in source order (items
+    repeated verbatim under the same context are kept once), and duplicate_keys maps
+    each repeated key to the line numbers it appears on.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and isinstance(node.value, ast.Dict)
+                and any(isinstance(t, ast.Name) and t.id == name for t in node.targets)):
+            break
+    else:
+        raise ValueError(f"{name} dict not found in {path}")
+
+    data, lines, seen = {}, {}, set()
+    for key, value in zip(node.value.keys, node.value.values):
+        topic = ast.literal_eval(key)
+        lines.setdefault(topic, []).append(key.lineno)
+        items = data.setdefault(topic, [])
+        for item in ast.literal_eval(value):
+            identity = (topic, context_hash(item['context']), item['question'])
+            if identity not in seen:
+                seen.add(identity)
+                items.append(item)
+
+    duplicate_keys = {topic: found for topic, found in lines.items() if len(found) > 1}
+    return data, duplicate_keys
+
+
+def shuffle_options(question: Question, rng=random) -> Question:
+    """A copy of question with its options in random order"""
+    order = list(range(len(question.options)))
+    rng.shuffle(order)
+    return Question(question.question, [question.options[i] for i in order],
+                    order.index(question.correct_index), question.section_id)
+
+
+class QuestionBank:
+    """
+    Curated questions indexed by topic and by context hash. Each item becomes one
+    Question when the bank loads (correct answer first), so serving one is a lookup
+    and an option shuffle rather than any generation work.
+    """
+
+    def __init__(self, training_data: dict, duplicate_keys: dict = None, max_wrong: int = 3):
+        self.duplicate_keys = MappingProxyType(dict(duplicate_keys or {}))
+        self.items = MappingProxyType({topic: tuple(items) for topic, items in training_data.items()})
+        by_topic, by_context = {}, {}
+        for topic, items in training_data.items():
+            questions = by_topic.setdefault(topic.lower(), [])
+            for item in items:
+                options = [item['correct_answer']] + list(item['wrong_answers'][:max_wrong])
+                question = Question(item['question'], options, 0)
+                questions.append(question)
+                by_context.setdefault(context_hash(item['context']), question)
+        self.by_topic = MappingProxyType({topic: tuple(q) for topic, q in by_topic.items()})
+        self.by_context = MappingProxyType(by_context)
+
+    @classmethod
+    def load(cls, path: str = CONTENT_DATABASE) -> 'QuestionBank':
+        data, duplicate_keys = load_training_data(path)
+        for topic, found in duplicate_keys.items():
+            print(f"Warning: TRAINING_DATA key '{topic}' appears {len(found)} times "
+                  f"(lines {', '.join(map(str, found))}); entries merged")
+        return cls(data, duplicate_keys)
+
+    def __len__(self):
+        return sum(len(questions) for questions in self.by_topic.values())
+
+    def topics(self) -> list:
+        return list(self.by_topic.keys())
+
+    def count(self, topic: str) -> int:
+        return len(self.by_topic.get(topic.lower(), ()))
+
+    def get(self, context: str):
+        """The question written for this context text (correct answer first), or None"""
+        return self.by_context.get(context_hash(context))
+
+    def draw(self, topic: str, k: int, rng=random) -> list:
+        """
+        Up to k distinct questions for a topic, in random order (O(k)), each with its
+        options freshly shuffled so the correct answer's position varies between quizzes
+        """
+        questions = self.by_topic.get(topic.lower(), ())
+        k = max(0, min(k, len(questions)))
+        return [shuffle_options(questions[i], rng) for i in sample_positions(len(questions), k, rng)]
+
+
+if __name__ == "__main__":
+    bank = QuestionBank.load()
+    print(f"{len(bank)} curated questions")
+    for topic in bank.topics():
+        print(f"  {topic:<28} {bank.count(topic)}")
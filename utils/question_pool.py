@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import deque
+
+
+class QuestionPool:
+    """
+    Per-topic pools of ready-made questions kept at target_size by a background thread.
+    take() pops questions in O(1) each; anything the pool cannot cover counts as a miss
+    and is left for the caller to generate inline.
+    """
+
+    def __init__(self, engine, topics=None, target_size: int = 20, batch_size: int = 5,
+                 idle_interval: float = 1.0):
+        self.engine = engine
+        self.topics = list(topics or engine.get_available_topics())
+        self.target_size = target_size
+        self.batch_size = batch_size
+        self.idle_interval = idle_interval
+
+        self._pools = {topic: deque() for topic in self.topics}  # (section id, question)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.generated = 0
+        self.refill_seconds = 0.0
+        self.served = 0
+        self.misses = 0
+
+    def start(self):
+        """Start the background refill thread (no-op if already running)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="question-pool", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def take(self, topic: str, count: int) -> list:
+        """Pop up to count (section id, question) pairs for topic"""
+        taken = []
+        pool = self._pools.get(topic.lower())
+        with self._lock:
+            while pool and len(taken) < count:
+                taken.append(pool.popleft())
+            self.served += len(taken)
+            self.misses += count - len(taken)
+        self._wakeup.set()
+        return taken
+
+    def depth(self, topic: str) -> int:
+        return len(self._pools.get(topic.lower(), ()))
+
+    def fill(self, topic: str, count: int) -> int:
+        """Generate up to count questions for topic from sections not already pooled"""
+        pool = self._pools[topic]
+        with self._lock:
+            pooled = {section_id for section_id, _ in pool}
+        sampler = self.engine.get_sampler(topic)
+        sections = [s for s in sampler.sample(count + len(pooled)) if s.id not in pooled][:count]
+
+        start = time.perf_counter()
+        added = 0
+        for section in sections:
+            question = self.engine.content_processor.create_question(section)
+            if question:
+                with self._lock:
+                    pool.append((section.id, question))
+                added += 1
+        with self._lock:
+            self.generated += added
+            self.refill_seconds += time.perf_counter() - start
+        return added
+
+    def _run(self):
+        while not self._stop.is_set():
+            refilled = False
+            for topic in self.topics:
+                if self._stop.is_set():
+                    return
+                need = self.target_size - self.depth(topic)
+                if need > 0:
+                    try:
+                        refilled = self.fill(topic, min(need, self.batch_size)) > 0 or refilled
+                    except Exception as e:
+                        print(f"Error refilling question pool for {topic}: {e}")
+            if not refilled:
+                self._wakeup.wait(self.idle_interval)
+                self._wakeup.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'depth': {topic: len(pool) for topic, pool in self._pools.items()},
+                'target_size': self.target_size,
+                'generated': self.generated,
+                'refill_rate': self.generated / self.refill_seconds if self.refill_seconds else 0.0,
+                'served': self.served,
+                'misses': self.misses
+            }
@@ -0,0 +1,284 @@
+import random
+import threading
+import time
+import uuid
+from utils.content_processor import ContentProcessor
+from utils.metrics import LatencyStats
+from utils.parallel import ParallelQuestionGenerator
+from utils.question import Question
+from utils.question_pool import QuestionPool
+from utils.result_handler import ResultHandler
+from utils.sampling import SectionSampler
+
+
+def _rng(seed):
+    """Random source for a draw: reproducible when seeded"""
+    return random.Random(seed) if seed is not None else None
+
+
+class QuizEngine:
+    """
+    Quiz generation shared by every session in the process.
+    Besides the read-only corpus, section index and NLP tools it owns mutable shared
+    state: per-topic samplers (built once, then only read), the optional question pool
+    and its refill thread, latency metrics, and the result handler with its background
+    writer thread. Each of these is safe for concurrent use, so one instance can serve
+    concurrent callers; per-user state (the quiz being taken) lives with the caller.
+    """
+
+    def __init__(self, data_dir: str = None, section_weight=None, results_dir: str = "quiz_results",
+                 background_writes: bool = True, bank_ratio: float = 0.0):
+        """
+        section_weight, if given, maps a Section to its relative sampling weight.
+        background_writes queues result saves instead of writing on the caller's thread.
+        bank_ratio is the default share of each quiz taken from the curated question bank.
+        """
+        self.content_processor = ContentProcessor(data_dir)
+        self.bank_ratio = bank_ratio
+        self.result_handler = ResultHandler(results_dir, background=background_writes)
+        self.section_weight = section_weight
+        self._samplers = {}
+        self.question_pool = None
+        self._bulk_generator = None  # worker processes for generate_bulk, kept warm between jobs
+        self._bulk_lock = threading.Lock()
+        self.time_to_first_question = LatencyStats()
+
+    @staticmethod
+    def new_quiz_id() -> str:
+        """Stable identifier assigned to a quiz when it is generated"""
+        return uuid.uuid4().hex
+
+    def get_available_topics(self) -> list:
+        return self.content_processor.get_available_topics()
+
+    def get_sampler(self, topic: str) -> SectionSampler:
+        """Sampler over a topic's indexed sections (built once per topic)"""
+        topic = topic.lower()
+        sampler = self._samplers.get(topic)
+        if sampler is None:
+            sections = self.content_processor.get_sections(topic)
+            if not sections:
+                raise ValueError(f"Topic not found: {topic}")
+            weights = [self.section_weight(s) for s in sections] if self.section_weight else None
+            sampler = self._samplers[topic] = SectionSampler(sections, weights)
+        return sampler
+
+    def start_question_pool(self, target_size: int = 20) -> QuestionPool:
+        """Keep target_size ready-made questions per topic, refilled in the background"""
+        if self.question_pool is None:
+            self.question_pool = QuestionPool(self, target_size=target_size).start()
+        return self.question_pool
+
+    def generate_quiz(self, topic: str, num_questions: int, progress=None,
+                      seed=None, stratify: bool = False, bank_ratio: float = None) -> list:
+        """
+        Generate a quiz for the given topic.
+        progress, if given, is called as progress(done, total) after each question.
+        seed makes the section draw reproducible; stratify spreads it across content types.
+        bank_ratio (default self.bank_ratio) is the share of curated bank questions.
+        Raises ValueError for an unknown topic.
+        """
+        start = time.perf_counter()
+        plan = self.plan_quiz(topic, num_questions, seed=seed, stratify=stratify, bank_ratio=bank_ratio)
+        questions = []
+        for question in self.iter_plan(plan, start, self.get_sampler(topic), _rng(seed)):
+            questions.append(question)
+            if progress:
+                progress(len(questions), len(plan))
+        return questions
+
+    def generate_bulk(self, num_questions: int, topics=None, workers: int = None, seed=None) -> dict:
+        """
+        Generate up to num_questions per topic (all topics by default) on a pool of
+        worker processes. Returns {topic: [Question, ...]} in a deterministic order.
+        Failed or repeated questions are regenerated or replaced here, as in iter_plan.
+        The pool is started on the first call and reused until close().
+        """
+        topics = list(topics or self.get_available_topics())
+        plan = [self.get_sampler(topic).sample(num_questions, seed=seed) for topic in topics]
+
+        generator = self.bulk_generator(workers)
+        results = iter(generator.generate([s for sections in plan for s in sections]))
+
+        return {
+            # A section whose question failed in its worker is retried in this process
+            topic: list(self.iter_plan([next(results) or s for s in sections], None,
+                                       self.get_sampler(topic), _rng(seed)))
+            for topic, sections in zip(topics, plan)
+        }
+
+    def bulk_generator(self, workers: int = None) -> ParallelQuestionGenerator:
+        """
+        The engine's process pool, started on first use (workers defaults to the CPU
+        count). Asking for a different number of workers replaces it.
+        """
+        with self._bulk_lock:
+            generator = self._bulk_generator
+            if generator is not None and workers is not None and generator.workers != workers:
+                generator.close()
+                generator = None
+            if generator is None:
+                generator = self._bulk_generator = ParallelQuestionGenerator(self.content_processor, workers)
+            return generator
+
+    def close(self):
+        """Stop the question pool and bulk workers and flush pending result writes"""
+        if self.question_pool is not None:
+            self.question_pool.stop()
+        with self._bulk_lock:
+            if self._bulk_generator is not None:
+                self._bulk_generator.close()
+                self._bulk_generator = None
+        if self.result_handler.writer is not None:
+            self.result_handler.writer.close()
+
+    def plan_quiz(self, topic: str, num_questions: int, seed=None, stratify: bool = False,
+                  bank_ratio: float = None) -> list:
+        """
+        Decide what a quiz is made of, in order: ready-made Questions (from the pool and
+        the curated bank) and Sections still to generate. Bank questions make up
+        round(num_questions * bank_ratio) of the quiz (the ratio is clamped to [0, 1]), or
+        more if the topic has too few sections, and are placed at random positions.
+        Raises ValueError for an unknown topic.
+        """
+        sampler = self.get_sampler(topic)
+        bank = self.content_processor.question_bank
+        rng = random.Random(seed) if seed is not None else random
+        ratio = min(max(self.bank_ratio if bank_ratio is None else bank_ratio, 0.0), 1.0)
+        num_questions = max(0, min(num_questions, len(sampler) + (bank.count(topic) if ratio > 0 else 0)))
+
+        banked = []
+        if ratio > 0:
+            wanted = max(round(num_questions * ratio), num_questions - len(sampler), 0)
+            banked = bank.draw(topic, wanted, rng)
+        num_generated = num_questions - len(banked)
+
+        # Ready-made questions first (seeded or stratified draws bypass the pool),
+        # at most one per near-duplicate cluster
+        pooled, clusters = [], set()
+        if self.question_pool is not None and seed is None and not stratify:
+            index = self.content_processor.section_index
+            for section_id, question in self.question_pool.take(topic, num_generated):
+                cluster = index.sections[section_id].cluster
+                if cluster not in clusters:
+                    clusters.add(cluster)
+                    pooled.append(question)
+
+        plan = pooled + sampler.sample(num_generated - len(pooled), seed=seed, stratify=stratify,
+                                       exclude_clusters=clusters)
+        for question in banked:
+            plan.insert(rng.randrange(len(plan) + 1), question)
+        return plan
+
+    def find_sections(self, terms=(), match: str = 'all', topics=None) -> list:
+        """
+        Sections whose key terms include all (match='all') or any (match='any') of terms,
+        from any topic unless topics is given; with no terms, every section of topics.
+        Raises ValueError for an unknown topic or when nothing matches.
+        """
+        index = self.content_processor.section_index
+        terms, topics = self._custom_query(terms, topics)
+        unknown = topics - set(index.topics())
+        if unknown:
+            raise ValueError(f"Topic not found: {', '.join(sorted(unknown))}")
+        if not terms and not topics:
+            raise ValueError("Give at least one key term or topic")
+
+        if terms:
+            sections = [index.sections[i] for i in index.terms.search(terms, match)]
+            if topics:
+                sections = [s for s in sections if s.topic in topics]
+        else:
+            sections = [s for topic in sorted(topics) for s in index.get(topic)]
+        if not sections:
+            raise ValueError(f"No sections mention {f' {match.upper()} '.join(terms)}")
+        return sections
+
+    @staticmethod
+    def _custom_query(terms=(), topics=None) -> tuple:
+        """Non-blank terms and the lowercased set of topics of a custom quiz"""
+        return [term for term in terms if term.strip()], {topic.lower() for topic in topics or ()}
+
+    @classmethod
+    def describe_custom_quiz(cls, terms=(), match: str = 'all', topics=None) -> str:
+        """Label stored as the topic of a key-term or cross-topic quiz"""
+        terms, topics = cls._custom_query(terms, topics)
+        topics = '+'.join(sorted(topics))
+        if terms:
+            label = f"terms: {f' {match} '.join(terms)}"
+            return f"{label} in {topics}" if topics else label
+        return topics
+
+    def iter_custom_quiz(self, num_questions: int, terms=(), match: str = 'all', topics=None, seed=None):
+        """
+        Yield questions on sections chosen by key terms and/or across several topics
+        (see find_sections), generated as they are ready
+        """
+        start = time.perf_counter()
+        sampler = SectionSampler(self.find_sections(terms, match, topics))
+        return self.iter_plan(sampler.sample(num_questions, seed=seed), start, sampler, _rng(seed))
+
+    def generate_custom_quiz(self, num_questions: int, terms=(), match: str = 'all', topics=None,
+                             seed=None) -> list:
+        return list(self.iter_custom_quiz(num_questions, terms, match, topics, seed))
+
+    def iter_quiz(self, topic: str, num_questions: int, seed=None, stratify: bool = False,
+                  bank_ratio: float = None):
+        """
+        Yield each question as soon as it is ready (same arguments as generate_quiz).
+        The delay before the first question is recorded in time_to_first_question.
+        """
+        start = time.perf_counter()
+        plan = self.plan_quiz(topic, num_questions, seed=seed, stratify=stratify, bank_ratio=bank_ratio)
+        return self.iter_plan(plan, start, self.get_sampler(topic), _rng(seed))
+
+    def iter_plan(self, plan, start: float = None, sampler: SectionSampler = None, rng=None):
+        """
+        Yield a question per plan entry: ready Questions as they are, Sections generated
+        in turn. A question whose wording repeats an earlier one in the quiz is generated
+        again from its section (the templates vary). One that still repeats, has no section
+        to regenerate from (curated questions) or fails is replaced by a section drawn from
+        sampler, if given, outside every cluster already in the plan; without one (or once
+        the clusters run out) it is dropped. With start (a perf_counter time), the delay
+        to the first question is recorded in time_to_first_question.
+        """
+        plan = list(plan)
+        asked = set()
+        sections = self.content_processor.section_index.sections
+        used = {self._cluster_of(item, sections) for item in plan} - {None}
+        for item in plan:
+            if not isinstance(item, Question):
+                question = self._create_distinct(item, asked)
+            elif item.question.lower() not in asked:
+                question = item
+            elif item.section_id is not None:
+                question = self._create_distinct(sections[item.section_id], asked)
+            else:
+                question = None
+            while not question and sampler is not None:
+                spare = sampler.sample(1, rng=rng, exclude_clusters=used)
+                if not spare:
+                    break
+                used.add(spare[0].cluster)
+                question = self._create_distinct(spare[0], asked)
+            if not question:
+                continue
+            asked.add(question.question.lower())
+            if start is not None:
+                self.time_to_first_question.record(time.perf_counter() - start)
+                start = None
+            yield question
+
+    @staticmethod
+    def _cluster_of(item, sections):
+        """Near-duplicate cluster of a plan entry (None for curated questions)"""
+        if isinstance(item, Question):
+            return sections[item.section_id].cluster if item.section_id is not None else None
+        return item.cluster
+
+    def _create_distinct(self, section, asked: set, attempts: int = 3):
+        for _ in range(attempts):
+            question = self.content_processor.create_question(section)
+            if question is None or question.question.lower() not in asked:
+                return question
+        return None
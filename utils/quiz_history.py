@@ -1,34 +1,180 @@
+import argparse
 import json
+import os
+import time
 from datetime import datetime
-from typing import List, Dict
+from typing import Iterator, List, Dict
+from utils.file_lock import atomic_write, file_lock
 
 class QuizHistory:
-    def __init__(self, filename: str = 'quiz_history.json'):
+    """
+    Quiz history as an append-only log with one JSON object per line.
+    Appends are O(1); fsync is batched: an append fsyncs once fsync_every appends are
+    pending or the last fsync is older than fsync_interval seconds, and flush/close
+    fsync whatever is left. There is no timer, so the last appends before an idle
+    period stay unsynced until the next append, flush or close.
+    Reading streams the file instead of holding it in memory.
+
+    A history in the old single-JSON-array format is converted on open, whether it is
+    filename itself or, for a .jsonl filename, the .json file of the same name
+    (quiz_history.json for the default), which is then renamed to .json.bak.
+
+    Several processes may share one log: each line goes out in a single write under an
+    exclusive file lock, and compaction swaps the file in atomically under the same lock
+    (appenders notice the swap and reopen). Readers take no lock and ignore a trailing
+    line that is still being written.
+    """
+
+    def __init__(self, filename: str = 'quiz_history.jsonl', fsync_every: int = 32,
+                 fsync_interval: float = 1.0):
         self.filename = filename
-        self.history = self.load_history()
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._file = None  # O_APPEND file descriptor
+        self._needs_newline = False
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._convert_legacy_file()
 
     def add_quiz(self, quiz: Dict):
         """Add a new quiz to history"""
-        self.history.append(quiz)
-        self.save_history()
+        line = (json.dumps(quiz, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        with file_lock(self.filename):
+            self._open_current()
+            if self._needs_newline:
+                line = b'\n' + line  # seal a line cut short by a crash
+                self._needs_newline = False
+            os.write(self._file, line)
+        self._pending += 1
+        if (self._pending >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.flush()
+
+    def _open_current(self):
+        """(Re)open the log for appending if it is not open or was replaced by compaction"""
+        if self._file is not None:
+            try:
+                if os.fstat(self._file).st_ino == os.stat(self.filename).st_ino:
+                    return
+            except FileNotFoundError:
+                pass
+            self._close_file()
+        self._file = os.open(self.filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        size = os.fstat(self._file).st_size
+        self._needs_newline = size > 0 and not self._ends_with_newline()
+
+    def flush(self):
+        """fsync appends made since the last flush"""
+        if self._file is not None and self._pending:
+            os.fsync(self._file)
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self._close_file()
+
+    def _close_file(self):
+        if self._file is not None:
+            os.close(self._file)
+            self._file = None
+
+    def iter_history(self) -> Iterator[Dict]:
+        """Stream saved quizzes, oldest first"""
+        try:
+            f = open(self.filename, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            for line_number, line in enumerate(f, 1):
+                if not line.endswith('\n'):
+                    break  # still being appended
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    print(f"Warning: skipping malformed history line {line_number} in {self.filename}")
 
     def get_all(self) -> List[Dict]:
         """Get all saved quizzes"""
-        return self.history
+        return list(self.iter_history())
+
+    @property
+    def history(self) -> List[Dict]:
+        return self.get_all()
 
     def get_timestamp(self) -> str:
         """Get current timestamp"""
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     def save_history(self):
-        """Save quiz history to file"""
-        with open(self.filename, 'w') as f:
-            json.dump(self.history, f, indent=4)
+        """Save quiz history to file (appends are already on disk; this forces an fsync)"""
+        self.flush()
 
     def load_history(self) -> List[Dict]:
         """Load quiz history from file"""
+        return self.get_all()
+
+    def compact(self, keep_last: int = None) -> int:
+        """
+        Rewrite the log without malformed lines, optionally keeping only the newest
+        keep_last entries. Returns the number of entries kept.
+        """
+        self.close()
+        with file_lock(self.filename):
+            entries = self.get_all()
+            if keep_last is not None:
+                entries = entries[-keep_last:] if keep_last > 0 else []
+            self._rewrite(entries)
+        return len(entries)
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.filename, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def _rewrite(self, entries: List[Dict]):
+        atomic_write(self.filename, ''.join(
+            json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n' for entry in entries
+        ))
+
+    def _convert_legacy_file(self):
+        """Turn a history file in the old single-JSON-array format into the line format"""
+        legacy = self.filename[:-1] if self.filename.endswith('.jsonl') else None
+        if not os.path.exists(self.filename) and not (legacy and os.path.exists(legacy)):
+            return
+        with file_lock(self.filename):
+            if os.path.exists(self.filename):
+                entries = self._read_legacy(self.filename)
+                if entries is not None:
+                    self._rewrite(entries)
+            elif legacy:
+                # The pre-JSONL default was quiz_history.json; carry it over once
+                entries = self._read_legacy(legacy)
+                if entries is not None:
+                    self._rewrite(entries)
+                    os.replace(legacy, legacy + '.bak')
+                    print(f"Converted {len(entries)} quiz history entries from {legacy} to {self.filename}")
+
+    @staticmethod
+    def _read_legacy(path: str):
+        """Entries of a single-JSON-array history file, or None if path is not one"""
         try:
-            with open(self.filename, 'r') as f:
+            with open(path, 'r', encoding='utf-8') as f:
+                if f.read(1) != '[':
+                    return None
+                f.seek(0)
                 return json.load(f)
-        except FileNotFoundError:
-            return []
+        except (FileNotFoundError, ValueError):
+            return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quiz history maintenance")
+    parser.add_argument('command', choices=['compact'])
+    parser.add_argument('filename', nargs='?', default='quiz_history.jsonl')
+    parser.add_argument('--keep-last', type=int, help="drop all but the newest N entries")
+    args = parser.parse_args()
+    kept = QuizHistory(args.filename).compact(args.keep_last)
+    print(f"Compacted {args.filename}: {kept} entries")
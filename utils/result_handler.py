@@ -1,11 +1,30 @@
-import json
+import uuid
 from datetime import datetime
 import os
+import threading
+from utils.background_writer import BackgroundResultWriter
+from utils.lru_cache import LRUCache
+from utils.question import as_question
+from utils.result_store import ResultStore, open_result_store, score_result
 
 class ResultHandler:
-    def __init__(self):
-        self.results_dir = "quiz_results"
+    def __init__(self, results_dir: str = "quiz_results", store: ResultStore = None,
+                 background: bool = False):
+        """background=True hands saves to a BackgroundResultWriter instead of writing inline"""
+        self.results_dir = results_dir
         self.ensure_results_directory()
+        self.store = store or open_result_store(results_dir=results_dir)
+        # Quiz IDs already saved by this process, so repeat saves skip the filesystem
+        self._saved_ids = LRUCache(100000)
+        # Quiz IDs queued on the writer but not yet stored
+        self._pending_ids = set()
+        self._pending_lock = threading.Lock()
+        self.writer = BackgroundResultWriter(
+            self.store, spill_path=os.path.join(results_dir, "unsaved_results.jsonl"),
+            on_done=self._on_write_done
+        ) if background else None
+        self.writes = 0
+        self.duplicate_saves = 0
 
     def ensure_results_directory(self):
         """Create results directory if it doesn't exist"""
@@ -44,9 +63,10 @@ class ResultHandler:
             print(self._format_text(q['question']))
             print("-" * 40)
 
+            correct_index = as_question(q).correct_index
             for j, option in enumerate(q['options']):
                 option_text = self._format_text(option)
-                is_correct = option == q['correct_answer']
+                is_correct = j == correct_index
                 marker = " ✓ (Correct Answer)" if is_correct else ""
                 print(f"{chr(65+j)}. {option_text}{marker}")
 
@@ -79,26 +99,60 @@ class ResultHandler:
         return '\n   '.join(lines)
 
     def _save_quiz_result(self, quiz: list):
-        """Save quiz results to file"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = os.path.join(self.results_dir, f"quiz_result_{timestamp}.json")
-
-        result_data = {
-            "timestamp": timestamp,
-            "questions": []
-        }
-
-        for q in quiz:
-            question_data = {
-                "question": q['question'],
-                "options": q['options'],
-                "correct_answer": q['correct_answer']
-            }
-            result_data["questions"].append(question_data)
-
+        """Save quiz results to the result store"""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(result_data, f, indent=4, ensure_ascii=False)
-            print(f"\nQuiz results saved to: {filename}")
+            location = self.save_result(uuid.uuid4().hex, quiz, {})
+            print(f"\nQuiz results saved to: {location}")
         except Exception as e:
             print(f"\nError saving quiz results: {e}")
+
+    def save_result(self, quiz_id: str, quiz: list, user_answers: dict, topic: str = None) -> str:
+        """
+        Save a submitted quiz with the user's answers (question index -> option index);
+        returns where it was stored.
+        Saving is idempotent per quiz_id: repeats are a no-op, answered from memory
+        when this process already saved (or queued) the result, and by the store's unique
+        key otherwise. With a background writer the record is only queued here; its ID
+        counts as saved once the writer has stored it, and a record the writer had to
+        spill can be saved again.
+        """
+        if self._saved_ids.get(quiz_id):
+            self.duplicate_saves += 1
+            return self.store.location(quiz_id)
+
+        if self.writer is not None:
+            with self._pending_lock:
+                if quiz_id in self._pending_ids:
+                    self.duplicate_saves += 1
+                    return self.store.location(quiz_id)
+                self._pending_ids.add(quiz_id)
+            self.writer.submit(self.build_record(quiz_id, quiz, user_answers, topic))
+            self.writes += 1
+            return self.store.location(quiz_id)
+
+        if self.store.save(self.build_record(quiz_id, quiz, user_answers, topic)):
+            self.writes += 1
+        else:
+            self.duplicate_saves += 1
+        self._saved_ids.put(quiz_id, True)
+        return self.store.location(quiz_id)
+
+    def _on_write_done(self, record: dict, written: bool):
+        """Called by the background writer once a record is stored or spilled"""
+        if written:
+            self._saved_ids.put(record['quiz_id'], True)
+        with self._pending_lock:
+            self._pending_ids.discard(record['quiz_id'])
+
+    @staticmethod
+    def build_record(quiz_id: str, quiz: list, user_answers: dict, topic: str = None) -> dict:
+        """Result record in the ResultStore format"""
+        questions = [as_question(q).to_record() for q in quiz]
+        return {
+            "quiz_id": quiz_id,
+            "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S"),
+            "topic": topic,
+            "score": score_result(questions, user_answers),
+            "questions": questions,
+            "user_answers": {str(i): answer for i, answer in user_answers.items()}
+        }
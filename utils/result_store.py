@@ -0,0 +1,410 @@
+import glob
+import json
+import os
+import sqlite3
+import sys
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from utils.file_lock import atomic_write_json, file_lock
+
+# Where results go unless a store is passed in: "sqlite:<path>" or "json:<directory>"
+RESULT_STORE_ENV = 'QUIZ_RESULT_STORE'
+
+
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+
+def days_ago(days: float, now: datetime = None) -> str:
+    """Record timestamp for a moment `days` before now, for use as a `since` bound"""
+    return ((now or datetime.now()) - timedelta(days=days)).strftime(TIMESTAMP_FORMAT)
+
+
+def question_outcomes(questions: list, user_answers: dict) -> list:
+    """
+    (question text, answered correctly) per question (answers keyed by question index,
+    int or str). Questions with correct_index take option indices as answers; older
+    records with only correct_answer take the option text.
+    """
+    outcomes = []
+    for i, q in enumerate(questions):
+        answer = user_answers.get(i, user_answers.get(str(i)))
+        if 'correct_index' in q:
+            correct = answer == q['correct_index']
+        else:
+            correct = answer == q['correct_answer']
+        outcomes.append((q['question'], correct))
+    return outcomes
+
+
+def score_result(questions: list, user_answers: dict) -> float:
+    """Percentage of questions answered correctly"""
+    if not questions:
+        return 0.0
+    correct = sum(correct for _, correct in question_outcomes(questions, user_answers))
+    return correct / len(questions) * 100
+
+
+class ResultStore(ABC):
+    """
+    Interface for quiz result persistence. A record is a dict with quiz_id,
+    timestamp ("%Y%m%d_%H%M%S"), topic, score, questions and user_answers.
+    Questions carry correct_index and user_answers map question index to option
+    index; records written before that have correct_answer and option text instead.
+    Backends implement the abstract methods; the rest have scan-based defaults.
+    """
+
+    def save(self, record: dict) -> bool:
+        """Store a record; returns False (and writes nothing) if its quiz_id already exists"""
+        return self.save_many([record]) == 1
+
+    @abstractmethod
+    def save_many(self, records: list) -> int:
+        """Store several records; returns how many were new"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, quiz_id: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    def query(self, topic: str = None, since: str = None, until: str = None,
+              min_score: float = None, limit: int = None) -> list:
+        """Records matching every given filter, oldest first"""
+        raise NotImplementedError
+
+    def scores(self, topic: str = None, since: str = None, until: str = None) -> list:
+        """(timestamp, score) pairs matching the filters, oldest first"""
+        return [(r['timestamp'], r['score']) for r in self.query(topic, since, until)]
+
+    def most_missed(self, topic: str = None, since: str = None, limit: int = 10) -> list:
+        """
+        Questions answered wrongly most often, as dicts with question, topic, attempts,
+        misses and miss_rate; most misses first.
+        """
+        stats = {}
+        for record in self.query(topic, since):
+            for question, correct in question_outcomes(record['questions'], record['user_answers']):
+                entry = stats.setdefault((question, record['topic'] or ''), [0, 0])
+                entry[0] += 1
+                entry[1] += not correct
+        ranked = sorted(stats.items(), key=lambda item: (-item[1][1], item[0]))
+        return [_missed_entry(question, topic, attempts, misses)
+                for (question, topic), (attempts, misses) in ranked[:limit] if misses]
+
+    @abstractmethod
+    def iter_records(self):
+        raise NotImplementedError
+
+    def contains(self, quiz_id: str) -> bool:
+        return self.get(quiz_id) is not None
+
+    @abstractmethod
+    def count(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def location(self, quiz_id: str) -> str:
+        """Human-readable place a record is stored"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+def _missed_entry(question: str, topic: str, attempts: int, misses: int) -> dict:
+    return {'question': question, 'topic': topic or None, 'attempts': attempts,
+            'misses': misses, 'miss_rate': misses / attempts if attempts else 0.0}
+
+
+class JSONFileResultStore(ResultStore):
+    """
+    One pretty-printed JSON file per quiz (the original format). Files are written
+    atomically under a directory-wide lock, so concurrent processes never overwrite
+    each other's results and readers never see a half-written file.
+    """
+
+    def __init__(self, results_dir: str = "quiz_results"):
+        self.results_dir = results_dir
+        os.makedirs(results_dir, exist_ok=True)
+
+    def _path(self, quiz_id: str) -> str:
+        return os.path.join(self.results_dir, f"quiz_result_{quiz_id}.json")
+
+    def save_many(self, records: list) -> int:
+        written = 0
+        with file_lock(os.path.join(self.results_dir, "results")):
+            for record in records:
+                path = self._path(record['quiz_id'])
+                if not os.path.exists(path):
+                    atomic_write_json(path, record, indent=4, ensure_ascii=False)
+                    written += 1
+        return written
+
+    def get(self, quiz_id: str):
+        return self._load(self._path(quiz_id))
+
+    def query(self, topic=None, since=None, until=None, min_score=None, limit=None) -> list:
+        matches = sorted(
+            (r for r in self.iter_records()
+             if (topic is None or r['topic'] == topic)
+             and (since is None or r['timestamp'] >= since)
+             and (until is None or r['timestamp'] < until)
+             and (min_score is None or r['score'] >= min_score)),
+            key=lambda r: r['timestamp']
+        )
+        return matches[:limit] if limit is not None else matches
+
+    def iter_records(self):
+        for path in sorted(glob.glob(os.path.join(self.results_dir, "quiz_result_*.json"))):
+            record = self._load(path)
+            if record is not None:
+                yield record
+
+    def contains(self, quiz_id: str) -> bool:
+        return os.path.exists(self._path(quiz_id))
+
+    def count(self) -> int:
+        return len(glob.glob(os.path.join(self.results_dir, "quiz_result_*.json")))
+
+    def location(self, quiz_id: str) -> str:
+        return self._path(quiz_id)
+
+    @staticmethod
+    def _load(path: str):
+        """Read a result file, filling in fields that files from older versions lack"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Warning: skipping unreadable result file {path}: {e}")
+            return None
+
+        name = os.path.basename(path)[len("quiz_result_"):-len(".json")]
+        record.setdefault('quiz_id', name)
+        record.setdefault('timestamp', name)
+        record.setdefault('topic', None)
+        record.setdefault('user_answers', {})
+        if record.get('score') is None:
+            record['score'] = score_result(record.get('questions', []), record['user_answers'])
+        return record
+
+
+class SQLiteResultStore(ResultStore):
+    """
+    Results in one SQLite database (WAL mode) with indexes on timestamp, topic and score.
+    Each insert also adds one `answers` row per question and bumps that question's
+    running totals in `question_stats`, so score history and most-missed questions
+    are answered from indexes instead of decoding every stored record.
+    """
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path: str = "quiz_results/quiz_results.db"):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS results (
+                    quiz_id   TEXT PRIMARY KEY,
+                    timestamp TEXT NOT NULL,
+                    topic     TEXT,
+                    score     REAL,
+                    data      TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_results_timestamp ON results (timestamp);
+                CREATE INDEX IF NOT EXISTS idx_results_topic ON results (topic, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_results_score ON results (score);
+
+                CREATE TABLE IF NOT EXISTS answers (
+                    quiz_id   TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    topic     TEXT NOT NULL,
+                    question  TEXT NOT NULL,
+                    correct   INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_answers_timestamp ON answers (timestamp);
+                CREATE INDEX IF NOT EXISTS idx_answers_topic ON answers (topic, timestamp);
+
+                CREATE TABLE IF NOT EXISTS question_stats (
+                    question TEXT NOT NULL,
+                    topic    TEXT NOT NULL,
+                    attempts INTEGER NOT NULL,
+                    misses   INTEGER NOT NULL,
+                    PRIMARY KEY (question, topic)
+                );
+                CREATE INDEX IF NOT EXISTS idx_question_stats_misses ON question_stats (misses);
+                CREATE INDEX IF NOT EXISTS idx_question_stats_topic ON question_stats (topic, misses);
+            """)
+            if conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+                self._backfill_answers(conn)
+                conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not shared across threads)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def save_many(self, records: list) -> int:
+        conn = self._connection()
+        written = 0
+        with conn:
+            for r in records:
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?, ?)",
+                    (r['quiz_id'], r['timestamp'], r.get('topic'), r.get('score'),
+                     json.dumps(r, ensure_ascii=False, separators=(',', ':')))
+                ).rowcount
+                if inserted:
+                    self._index_answers(conn, r)
+                    written += 1
+        return written
+
+    @staticmethod
+    def _index_answers(conn: sqlite3.Connection, record: dict):
+        """Add a new record's per-question rows and update the running totals"""
+        topic = record.get('topic') or ''
+        outcomes = question_outcomes(record.get('questions', []), record.get('user_answers', {}))
+        conn.executemany(
+            "INSERT INTO answers VALUES (?, ?, ?, ?, ?)",
+            [(record['quiz_id'], record['timestamp'], topic, question, int(correct))
+             for question, correct in outcomes]
+        )
+        conn.executemany(
+            """INSERT INTO question_stats VALUES (?, ?, 1, ?)
+               ON CONFLICT (question, topic) DO UPDATE
+               SET attempts = attempts + 1, misses = misses + excluded.misses""",
+            [(question, topic, int(not correct)) for question, correct in outcomes]
+        )
+
+    def _backfill_answers(self, conn: sqlite3.Connection):
+        """Index records saved before the answers tables existed"""
+        conn.execute("DELETE FROM answers")
+        conn.execute("DELETE FROM question_stats")
+        for (data,) in conn.execute("SELECT data FROM results").fetchall():
+            self._index_answers(conn, json.loads(data))
+
+    def get(self, quiz_id: str):
+        row = self._connection().execute(
+            "SELECT data FROM results WHERE quiz_id = ?", (quiz_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query(self, topic=None, since=None, until=None, min_score=None, limit=None) -> list:
+        clauses, params = [], []
+        for clause, value in (("topic = ?", topic), ("timestamp >= ?", since),
+                              ("timestamp < ?", until), ("score >= ?", min_score)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        sql = "SELECT data FROM results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(data) for (data,) in self._connection().execute(sql, params)]
+
+    def scores(self, topic=None, since=None, until=None) -> list:
+        sql, params = self._filtered("SELECT timestamp, score FROM results", topic, since, until)
+        return self._connection().execute(sql + " ORDER BY timestamp", params).fetchall()
+
+    def most_missed(self, topic=None, since=None, limit=10) -> list:
+        conn = self._connection()
+        if since is None:
+            # Running totals: walks the misses index and stops after `limit` rows
+            sql = "SELECT question, topic, attempts, misses FROM question_stats WHERE misses > 0"
+            params = []
+            if topic is not None:
+                sql += " AND topic = ?"
+                params.append(topic)
+            rows = conn.execute(sql + " ORDER BY misses DESC, question, topic LIMIT ?", params + [limit])
+        else:
+            # Only the answers inside the time window are read
+            sql, params = self._filtered(
+                "SELECT question, topic, COUNT(*), SUM(1 - correct) AS misses FROM answers", topic, since, None)
+            rows = conn.execute(sql + " GROUP BY question, topic HAVING misses > 0"
+                                " ORDER BY misses DESC, question, topic LIMIT ?", params + [limit])
+        return [_missed_entry(*row) for row in rows]
+
+    @staticmethod
+    def _filtered(sql: str, topic=None, since=None, until=None):
+        clauses, params = [], []
+        for clause, value in (("topic = ?", topic), ("timestamp >= ?", since), ("timestamp < ?", until)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return sql, params
+
+    def iter_records(self):
+        for (data,) in self._connection().execute("SELECT data FROM results ORDER BY timestamp"):
+            yield json.loads(data)
+
+    def contains(self, quiz_id: str) -> bool:
+        return self._connection().execute(
+            "SELECT 1 FROM results WHERE quiz_id = ?", (quiz_id,)).fetchone() is not None
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def location(self, quiz_id: str) -> str:
+        return f"{self.path} (quiz {quiz_id})"
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def open_result_store(spec: str = None, results_dir: str = "quiz_results") -> ResultStore:
+    """
+    Open the store named by spec (or $QUIZ_RESULT_STORE): "sqlite:<path>" or
+    "json:<directory>". Defaults to SQLite at <results_dir>/quiz_results.db.
+    """
+    spec = spec or os.environ.get(RESULT_STORE_ENV) or f"sqlite:{os.path.join(results_dir, 'quiz_results.db')}"
+    kind, _, target = spec.partition(':')
+    if kind == 'sqlite':
+        return SQLiteResultStore(target)
+    if kind == 'json':
+        return JSONFileResultStore(target or results_dir)
+    raise ValueError(f"Unknown result store: {spec}")
+
+
+def migrate_json_results(results_dir: str, store: ResultStore, batch_size: int = 500) -> int:
+    """
+    Import JSON result files from results_dir into store; returns how many were new.
+    Files whose quiz_id is already in the store are not opened, so rerunning this as
+    new files arrive only reads the new ones.
+    """
+    imported = 0
+    batch = []
+    for path in sorted(glob.glob(os.path.join(results_dir, "quiz_result_*.json"))):
+        if store.contains(os.path.basename(path)[len("quiz_result_"):-len(".json")]):
+            continue
+        record = JSONFileResultStore._load(path)
+        if record is None:
+            continue
+        batch.append(record)
+        if len(batch) >= batch_size:
+            imported += store.save_many(batch)
+            batch = []
+    if batch:
+        imported += store.save_many(batch)
+    return imported
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] != 'migrate':
+        print("Usage: python -m utils.result_store migrate <results_dir> [store spec]")
+        sys.exit(1)
+    target = open_result_store(sys.argv[3] if len(sys.argv) > 3 else None, sys.argv[2])
+    print(f"Imported {migrate_json_results(sys.argv[2], target)} results ({target.count()} total)")
@@ -0,0 +1,165 @@
+import random
+from itertools import islice
+
+
+class AliasTable:
+    """Walker/Vose alias table: O(n) to build, O(1) per weighted draw"""
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0 or any(w < 0 for w in weights):
+            raise ValueError("weights must be non-negative with a positive sum")
+
+        self.prob = [0.0] * n
+        self.alias = list(range(n))
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def draw(self, rng=random) -> int:
+        i = rng.randrange(len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+def _iter_positions(n: int, rng):
+    """Distinct positions from range(n) in random order, each in O(1) (sparse Fisher-Yates)"""
+    swapped = {}
+    for i in range(n):
+        j = rng.randrange(i, n)
+        yield swapped.get(j, j)
+        swapped[j] = swapped.get(i, i)
+
+
+def sample_positions(n: int, k: int, rng) -> list:
+    """k distinct positions from range(n) in O(k) time and memory"""
+    return list(islice(_iter_positions(n, rng), k))
+
+
+class SectionSampler:
+    """
+    Draws k distinct sections without replacement, by position, so duplicate
+    section texts are handled. Optional per-section weights use an alias table;
+    zero-weight sections are never drawn, so a weighted draw returns fewer than k
+    once the sections with positive weight run out. Stratified draws split k across
+    content types in proportion to their size. A draw never returns two sections
+    from the same near-duplicate cluster.
+    """
+
+    def __init__(self, sections, weights=None):
+        self.sections = tuple(sections)
+        self.weights = list(weights) if weights is not None else None
+        self._alias = AliasTable(self.weights) if self.weights is not None else None
+
+        self.strata = {}
+        for i, section in enumerate(self.sections):
+            self.strata.setdefault(section.content_type, []).append(i)
+        self._stratum_alias = {}
+        self._clusters = [section.cluster for section in self.sections]
+        self.num_clusters = len(set(self._clusters))
+
+    def __len__(self):
+        """Most sections one draw can return (one per near-duplicate cluster)"""
+        return self.num_clusters
+
+    def sample(self, k: int, seed=None, rng=None, stratify: bool = False, exclude_clusters=()) -> list:
+        """
+        Return up to k distinct sections, at most one per cluster and none from
+        exclude_clusters. Pass seed (or a random.Random as rng) for reproducible draws.
+        """
+        if rng is None:
+            rng = random.Random(seed) if seed is not None else random
+        k = min(k, self.num_clusters)
+        if k <= 0:
+            return []
+
+        seen = set(exclude_clusters)
+        all_positions = range(len(self.sections))
+        if stratify:
+            positions = self._sample_stratified(k, rng, seen)
+            if len(positions) < k:  # strata lost draws to clusters shared with other strata
+                positions += self._sample_from(all_positions, self._alias, k - len(positions), rng, seen)
+        else:
+            positions = self._sample_from(all_positions, self._alias, k, rng, seen)
+        return [self.sections[i] for i in positions]
+
+    def _accept(self, position: int, seen: set) -> bool:
+        """Take position unless its cluster was already drawn (records the cluster)"""
+        cluster = self._clusters[position]
+        if cluster in seen:
+            return False
+        seen.add(cluster)
+        return True
+
+    def _sample_from(self, candidates, alias, k: int, rng, seen: set) -> list:
+        """Up to k distinct entries of candidates in unseen clusters, weighted through alias if given"""
+        if alias is None:
+            picked = []
+            for i in _iter_positions(len(candidates), rng):
+                if self._accept(candidates[i], seen):
+                    picked.append(candidates[i])
+                    if len(picked) == k:
+                        break
+            return picked
+
+        # Alias draws with rejection of repeats: expected O(k) unless k is close
+        # to the number of items carrying most of the weight
+        chosen = {}
+        for _ in range(32 * k):
+            i = alias.draw(rng)
+            if i not in chosen and self._accept(candidates[i], seen):
+                chosen[i] = None
+                if len(chosen) == k:
+                    return [candidates[i] for i in chosen]
+
+        # Too many repeats: finish with exact weighted sampling over the rest of the
+        # positive-weight candidates
+        remaining = [i for i in range(len(candidates))
+                     if i not in chosen and self.weights[candidates[i]] > 0
+                     and self._clusters[candidates[i]] not in seen]
+        weights = [self.weights[candidates[i]] for i in remaining]
+        while len(chosen) < k and remaining:
+            pick = rng.choices(range(len(remaining)), weights=weights)[0]
+            i = remaining.pop(pick)
+            weights.pop(pick)
+            if self._accept(candidates[i], seen):
+                chosen[i] = None
+        return [candidates[i] for i in chosen]
+
+    def _sample_stratified(self, k: int, rng, seen: set) -> list:
+        """Allocate k across content types (largest remainder) and sample each"""
+        n = len(self.sections)
+        quotas = {}
+        remainders = []
+        for content_type, members in self.strata.items():
+            exact = k * len(members) / n
+            quotas[content_type] = int(exact)
+            remainders.append((exact - int(exact), rng.random(), content_type))
+        for _, _, content_type in sorted(remainders, reverse=True)[:k - sum(quotas.values())]:
+            quotas[content_type] += 1
+
+        positions = []
+        for content_type, quota in quotas.items():
+            table = self._stratum_table(content_type)
+            if quota and (table is not None or self.weights is None):
+                members = self.strata[content_type]
+                positions.extend(self._sample_from(members, table, quota, rng, seen))
+        rng.shuffle(positions)
+        return positions
+
+    def _stratum_table(self, content_type):
+        if self.weights is None:
+            return None
+        if content_type not in self._stratum_alias:
+            weights = [self.weights[i] for i in self.strata[content_type]]
+            self._stratum_alias[content_type] = AliasTable(weights) if sum(weights) > 0 else None
+        return self._stratum_alias[content_type]
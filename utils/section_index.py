@@ -0,0 +1,182 @@
+import hashlib
+import os
+import pickle
+import threading
+from types import MappingProxyType
+from typing import NamedTuple, Tuple
+import nltk
+from utils.near_duplicates import cluster_near_duplicates
+from utils.term_index import TermIndex
+
+# Bump when Section fields or the splitting/processing rules change
+INDEX_VERSION = 4
+
+SECTION_INDEX_ENV = 'QUIZ_SECTION_INDEX'
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'section_index.pkl'
+)
+
+
+class Section(NamedTuple):
+    """One content section with its NLP analysis precomputed"""
+    id: int
+    topic: str
+    text: str
+    word_count: int
+    sentences: Tuple[str, ...]
+    words: Tuple[str, ...]
+    pos_tags: Tuple[Tuple[str, str], ...]
+    key_terms: frozenset
+    content_type: str
+    cluster: int  # id of the first section in this section's near-duplicate cluster
+
+    @property
+    def processed(self) -> dict:
+        """Same shape as ContentProcessor._process_text output"""
+        return {
+            'sentences': self.sentences,
+            'words': self.words,
+            'pos_tags': self.pos_tags,
+            'key_terms': self.key_terms
+        }
+
+
+class SectionIndex:
+    """Immutable index of every section in the corpus, grouped by topic"""
+
+    def __init__(self, sections, content_hash: str, terms: TermIndex = None):
+        self.sections = tuple(sections)
+        self.content_hash = content_hash
+        # key term -> section ids, across all topics
+        self.terms = terms if terms is not None else TermIndex.build(self.sections)
+        by_topic, clusters = {}, {}
+        for section in self.sections:
+            by_topic.setdefault(section.topic, []).append(section)
+            clusters.setdefault(section.cluster, []).append(section.id)
+        self.by_topic = MappingProxyType({topic: tuple(s) for topic, s in by_topic.items()})
+        # cluster id -> ids of its sections
+        self.clusters = MappingProxyType({cluster: tuple(ids) for cluster, ids in clusters.items()})
+
+    def __len__(self):
+        return len(self.sections)
+
+    def get(self, topic: str) -> tuple:
+        """Sections for a topic (empty tuple if unknown)"""
+        return self.by_topic.get(topic.lower(), ())
+
+    def topics(self) -> list:
+        return list(self.by_topic.keys())
+
+    def cluster_of(self, section_id: int) -> tuple:
+        """Ids of every section in the same near-duplicate cluster (including itself)"""
+        return self.clusters[self.sections[section_id].cluster]
+
+    def save(self, path: str):
+        """Write the index to disk (atomically, so readers never see a partial file)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((INDEX_VERSION, self.content_hash, self.sections, dict(self.terms.postings)), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, content_hash: str = None):
+        """Load a saved index; returns None if missing, stale or unreadable"""
+        try:
+            with open(path, 'rb') as f:
+                version, saved_hash, *saved = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            return None
+        if version != INDEX_VERSION or (content_hash and saved_hash != content_hash):
+            return None
+        sections, postings = saved
+        return cls(sections, saved_hash, TermIndex(postings))
+
+
+def content_hash(content) -> str:
+    """Fingerprint of the corpus and the NLTK version that tagged it"""
+    digest = hashlib.sha1(f"{INDEX_VERSION}:{nltk.__version__}".encode('utf-8'))
+    for topic in sorted(content):
+        digest.update(topic.encode('utf-8'))
+        digest.update(content[topic].encode('utf-8'))
+    return digest.hexdigest()
+
+
+def build_section_index(processor) -> SectionIndex:
+    """
+    Split and process every topic in processor.content once, and group near-duplicate
+    sections (across all topics) into clusters
+    """
+    analyzed = []
+    for topic, content in processor.content.items():
+        texts = split_sections(content)
+        processed_texts = processor.process_batch(texts)
+        content_types = processor.classifier.classify_many(zip(texts, processed_texts))
+        analyzed.extend(zip([topic] * len(texts), texts, processed_texts, content_types))
+
+    clusters = cluster_near_duplicates([text for _, text, _, _ in analyzed])
+    sections = [
+        Section(
+            id=i,
+            topic=topic,
+            text=text,
+            word_count=len(text.split()),
+            sentences=tuple(processed['sentences']),
+            words=tuple(processed['words']),
+            pos_tags=tuple(tuple(pair) for pair in processed['pos_tags']),
+            key_terms=frozenset(processed['key_terms']),
+            content_type=content_type,
+            cluster=cluster
+        )
+        for i, ((topic, text, processed, content_type), cluster) in enumerate(zip(analyzed, clusters))
+    ]
+    return SectionIndex(sections, content_hash(processor.content))
+
+
+_lock = threading.Lock()
+
+
+def load_or_build_section_index(processor, path: str = None) -> SectionIndex:
+    """Load the on-disk index if it matches the corpus, else build and save it"""
+    path = path or os.environ.get(SECTION_INDEX_ENV) or DEFAULT_INDEX_PATH
+    expected_hash = content_hash(processor.content)
+    with _lock:
+        index = SectionIndex.load(path, expected_hash)
+        if index is not None:
+            return index
+
+        print("Building section index...")
+        index = build_section_index(processor)
+        try:
+            index.save(path)
+        except OSError as e:
+            print(f"Warning: could not save section index to {path}: {e}")
+        return index
+
+
+def split_sections(content: str) -> list:
+    """Split a topic's raw text into meaningful sections"""
+    sections = []
+    current_section = []
+
+    for line in content.split('\n'):
+        line = line.strip()
+        if not line:
+            if current_section:
+                sections.append(' '.join(current_section))
+                current_section = []
+        elif line.endswith(':'):
+            if current_section:
+                sections.append(' '.join(current_section))
+            current_section = [line]
+        elif line.startswith('-'):
+            sections.append(line[1:].strip())
+        else:
+            current_section.append(line)
+
+    if current_section:
+        sections.append(' '.join(current_section))
+
+    # Filter out very short sections
+    return [s for s in sections if len(s.split()) > 5]
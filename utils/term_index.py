@@ -0,0 +1,84 @@
+import heapq
+from bisect import bisect_left
+from types import MappingProxyType
+
+
+def normalize_term(term: str) -> str:
+    return term.strip().lower()
+
+
+def intersect(postings: list) -> list:
+    """
+    Ids present in every sorted posting list. Starts from the shortest list and
+    gallops through the others with binary search, so the cost follows the
+    shortest list rather than the longest.
+    """
+    if not postings:
+        return []
+    postings = sorted(postings, key=len)
+    result = list(postings[0])
+    for other in postings[1:]:
+        matched = []
+        lo = 0
+        for section_id in result:
+            lo = bisect_left(other, section_id, lo)
+            if lo == len(other):
+                break
+            if other[lo] == section_id:
+                matched.append(section_id)
+        result = matched
+        if not result:
+            break
+    return result
+
+
+def union(postings: list) -> list:
+    """Ids present in any sorted posting list, sorted, without duplicates"""
+    result = []
+    for section_id in heapq.merge(*postings):
+        if not result or result[-1] != section_id:
+            result.append(section_id)
+    return result
+
+
+class TermIndex:
+    """
+    Inverted index from key term (lowercased) to the sorted ids of the sections that
+    contain it, across all topics. Built with the section index and saved with it.
+    """
+
+    def __init__(self, postings: dict):
+        self.postings = MappingProxyType(postings)
+
+    @classmethod
+    def build(cls, sections) -> 'TermIndex':
+        postings = {}
+        for section in sections:
+            for term in {normalize_term(t) for t in section.key_terms}:
+                postings.setdefault(term, []).append(section.id)
+        return cls({term: tuple(sorted(ids)) for term, ids in postings.items()})
+
+    def __len__(self):
+        return len(self.postings)
+
+    def __contains__(self, term: str):
+        return normalize_term(term) in self.postings
+
+    def lookup(self, term: str) -> tuple:
+        """Sorted ids of the sections containing term"""
+        return self.postings.get(normalize_term(term), ())
+
+    def search(self, terms, match: str = 'all') -> list:
+        """Sorted ids of sections containing every term (match='all') or any term (match='any')"""
+        lists = [self.lookup(term) for term in terms if normalize_term(term)]
+        if match == 'all':
+            return intersect(lists)
+        if match == 'any':
+            return union(lists)
+        raise ValueError(f"match must be 'all' or 'any', not {match!r}")
+
+    def terms_like(self, prefix: str, limit: int = 20) -> list:
+        """Known terms starting with prefix, most widely used first"""
+        prefix = normalize_term(prefix)
+        matches = [term for term in self.postings if term.startswith(prefix)]
+        return sorted(matches, key=lambda term: (-len(self.postings[term]), term))[:limit]